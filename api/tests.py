@@ -1,3 +1,34 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from api.views import questions
+from api.views.questions import AllDataView, OFFLINE_QUESTIONS_PLACEHOLDER
+
+
+class OfflineStreamResponseTests(SimpleTestCase):
+    def stream(self, question_data):
+        offline_data = {
+            'version': '2.0',
+            'data': {'questions': OFFLINE_QUESTIONS_PLACEHOLDER, 'road_signs': []},
+            'metadata': {'counts': {'questions': 0, 'road_signs': 0}},
+        }
+        response = AllDataView()._stream_response(offline_data, question_data)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_questions_spliced_across_chunks(self):
+        rows = [{'id': str(i), 'translations': {'am': {'content': 'ጥያቄ'}}} for i in range(5)]
+        with mock.patch.object(questions, 'OFFLINE_EXPORT_CHUNK_SIZE', 2):
+            payload = self.stream(rows)
+
+        self.assertEqual(payload['data']['questions'], rows)
+        self.assertEqual(payload['data']['road_signs'], [])
+        self.assertEqual(payload['metadata']['counts']['questions'], 5)
+
+    def test_no_questions(self):
+        payload = self.stream([])
+
+        self.assertEqual(payload['data']['questions'], [])
+        self.assertEqual(payload['metadata']['counts']['questions'], 0)
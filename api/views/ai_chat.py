@@ -108,7 +108,7 @@ class AIChatView(APIView):
                 'session_id': session_id,
                 'created_at': chat_history.created_at.isoformat(),
                 'remaining_chats': bundle.chats_remaining if bundle else 0,
-                'daily_chats_remaining': max(0, bundle.bundle_definition.daily_chat_limit - bundle.daily_chats_used) if bundle else 0
+                'daily_chats_remaining': max(0, bundle.daily_chat_limit_snapshot - bundle.daily_chats_used) if bundle else 0
             })
             
         except Exception as e:
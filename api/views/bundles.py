@@ -7,6 +7,9 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import conditional_page
 import logging
 
 from core.authentication import TelegramAuthenticationBackend
@@ -25,6 +28,13 @@ from core.permissions import IsTelegramAuthenticated
 
 logger = logging.getLogger(__name__)
 
+# Per-user status polled by the app: ETag it so unchanged state comes back as a 304,
+# and keep it out of shared caches. no-cache makes clients revalidate on every poll
+conditional_status = method_decorator([
+    conditional_page,
+    cache_control(private=True, no_cache=True),
+])
+
 
 class BundleDefinitionViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -58,9 +68,12 @@ class UserBundleViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = UserBundleSerializer
     
     def get_queryset(self):
-        return UserBundle.objects.filter(user=self.request.user).order_by('-purchase_date')
+        return UserBundle.objects.filter(
+            user=self.request.user
+        ).with_expiry_status().with_remaining().order_by('-purchase_date')
     
     @action(detail=False, methods=['get'])
+    @conditional_status
     def active(self, request):
         """Get active bundle"""
         bundle = BundleService.get_active_bundle(request.user)
@@ -87,7 +100,9 @@ class BundlePurchaseViewSet(viewsets.ModelViewSet):
     serializer_class = BundlePurchaseSerializer
     
     def get_queryset(self):
-        return BundlePurchase.objects.filter(user=self.request.user).order_by('-created_at')
+        return BundlePurchase.objects.filter(
+            user=self.request.user
+        ).select_related('audit').order_by('-created_at')
     
     def create(self, request, *args, **kwargs):
         """Purchase a bundle"""
@@ -127,6 +142,7 @@ class BundlePurchaseViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_201_CREATED)
     
     @action(detail=False, methods=['get'])
+    @conditional_status
     def resources(self, request):
         """Get user's resource status"""
         resources = BundleService.get_user_resources(request.user)
@@ -145,7 +161,13 @@ class BundleOrderViewSet(viewsets.ModelViewSet):
     
 
     def get_queryset(self):
-        return BundleOrder.objects.filter(user=self.request.user).order_by('-created_at')
+        return BundleOrder.objects.filter(
+            user=self.request.user
+        ).select_related(
+            'bundle_definition', 'payment_method'
+        ).prefetch_related(
+            'payment_method__translations'
+        ).with_suggestions().order_by('-created_at')
     
     def create(self, request, *args, **kwargs):
         """
@@ -260,19 +282,14 @@ class BundleOrderViewSet(viewsets.ModelViewSet):
         GET /api/v1/bundles/orders/active/
         Get user's active orders
         """
-        active_orders = self.get_queryset().filter(
-            status__in=[
-                BundleOrder.OrderStatus.PENDING,
-                BundleOrder.OrderStatus.PAYMENT_VERIFIED,
-                BundleOrder.OrderStatus.INSUFFICIENT_FUNDS
-            ]
-        )
+        active_orders = self.get_queryset().open()
         
         serializer = self.get_serializer(active_orders, many=True)
+        data = serializer.data
         
         return Response({
-            'active_orders': serializer.data,
-            'count': active_orders.count()
+            'active_orders': data,
+            'count': len(data)  # rows are already loaded; no extra COUNT(*)
         })
     
     def _get_payment_instructions(self, payment_method):
@@ -280,14 +297,13 @@ class BundleOrderViewSet(viewsets.ModelViewSet):
         # Get instructions in user's preferred language
         language = self.request.user.profile.preferred_language
         
-        translation = payment_method.translations.filter(language=language).first()
-        if not translation and language != 'en':
-            translation = payment_method.translations.filter(language='en').first()
+        # Read from the denormalized i18n column; no translation queries
+        translation = payment_method.get_i18n(language)
         
         if translation:
             return {
-                'account_details': translation.account_details,
-                'instruction': translation.instruction,
+                'account_details': translation.get('account_details', ''),
+                'instruction': translation.get('instruction', ''),
                 'amount': float(payment_method.amount) if payment_method.amount else None
             }
         
@@ -444,15 +460,9 @@ class BundlePurchaseFlowView(APIView):
     def _get_account_details(self, payment_method):
         """Get account details for payment method"""
         language = self.request.user.profile.preferred_language
-        translation = payment_method.translations.filter(language=language).first()
-        if not translation and language != 'en':
-            translation = payment_method.translations.filter(language='en').first()
-        return translation.account_details if translation else ''
+        return payment_method.get_i18n(language).get('account_details', '')
     
     def _get_instructions(self, payment_method):
         """Get instructions for payment method"""
         language = self.request.user.profile.preferred_language
-        translation = payment_method.translations.filter(language=language).first()
-        if not translation and language != 'en':
-            translation = payment_method.translations.filter(language='en').first()
-        return translation.instruction if translation else ''
\ No newline at end of file
+        return payment_method.get_i18n(language).get('instruction', '')
\ No newline at end of file
@@ -3,13 +3,16 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.contrib.auth.models import User
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import F, Prefetch, Q, Count
+from django.db.models.functions import Greatest
 import random
 import logging
 
 from core.models import (
-    ExamSession, ExamQuestion, Question, 
+    ExamSession, ExamQuestion, Question,
     UserProfile, ResourceTransaction
 )
 from core.authentication import TelegramAuthenticationBackend
@@ -76,7 +79,7 @@ class ExamViewSet(viewsets.ModelViewSet):
         
         # Select questions based on bundle search quota
         searchable_limit = None
-        if bundle and not bundle.bundle_definition.is_unlimited_search:
+        if bundle and not bundle.is_unlimited_search:
             searchable_limit = bundle.search_remaining
         
         questions_qs = Question.objects.all()
@@ -106,17 +109,20 @@ class ExamViewSet(viewsets.ModelViewSet):
                 status=ExamSession.ExamStatus.IN_PROGRESS
             )
             
-            # Add questions to exam
-            for i, question in enumerate(selected_questions, 1):
-                ExamQuestion.objects.create(
+            # Add questions to exam in one INSERT
+            ExamQuestion.objects.bulk_create([
+                ExamQuestion(
                     exam_session=exam_session,
                     question=question,
                     order=i
                 )
+                for i, question in enumerate(selected_questions, 1)
+            ])
         
         # Update user stats
-        profile.total_exam_attempts += 1
-        profile.save()
+        UserProfile.objects.filter(pk=profile.pk).update(
+            total_exam_attempts=F('total_exam_attempts') + 1
+        )
         
         serializer = self.get_serializer(exam_session)
         return Response({
@@ -189,29 +195,50 @@ class ExamViewSet(viewsets.ModelViewSet):
                     'error': 'Exam is not in progress'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Calculate score
-            exam_questions = ExamQuestion.objects.filter(exam_session=exam)
-            total_questions = exam_questions.count()
-            correct_answers = exam_questions.filter(is_correct=True).count()
+            # Calculate score in a single aggregate query
+            totals = ExamQuestion.objects.filter(exam_session=exam).aggregate(
+                total=Count('id'),
+                correct=Count('id', filter=Q(is_correct=True))
+            )
+            total_questions = totals['total']
+            correct_answers = totals['correct']
             score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
             
             # Calculate time taken
-            time_taken = (timezone.now() - exam.start_time).seconds
+            end_time = timezone.now()
+            time_taken = (end_time - exam.start_time).seconds
             
-            # Update exam
+            # Update exam; filtering on status guards against double submission
+            updated = ExamSession.objects.filter(
+                pk=exam.pk,
+                status=ExamSession.ExamStatus.IN_PROGRESS
+            ).update(
+                status=ExamSession.ExamStatus.COMPLETED,
+                end_time=end_time,
+                score=score,
+                time_taken=time_taken,
+                passed=score >= 80  # 80% passing score
+            )
+            if not updated:
+                return Response({
+                    'error': 'Exam is not in progress'
+                }, status=status.HTTP_400_BAD_REQUEST)
             exam.status = ExamSession.ExamStatus.COMPLETED
-            exam.end_time = timezone.now()
+            exam.end_time = end_time
             exam.score = score
             exam.time_taken = time_taken
-            exam.passed = score >= 80  # 80% passing score
-            exam.save()
+            exam.passed = score >= 80
             
             # Update user profile
-            profile = request.user.profile
-            profile.correct_answers += correct_answers
-            if score > profile.highest_exam_score:
-                profile.highest_exam_score = score
-            profile.save()
+            UserProfile.objects.filter(user=request.user).update(
+                correct_answers=F('correct_answers') + correct_answers,
+                highest_exam_score=Greatest('highest_exam_score', score)
+            )
+            # The database recomputed accuracy_cached; refresh a profile this request already loaded
+            if User.profile.is_cached(request.user):
+                request.user.profile.refresh_from_db(
+                    fields=['correct_answers', 'highest_exam_score', 'accuracy_cached']
+                )
             
             serializer = self.get_serializer(exam)
             return Response({
@@ -243,29 +270,34 @@ class ExamViewSet(viewsets.ModelViewSet):
         # Get exam questions with explanations
         exam_questions = ExamQuestion.objects.filter(
             exam_session=exam
-        ).select_related(
-            'question__explanation',
-            'selected_answer'
+        ).select_related('selected_answer').prefetch_related(
+            # Everything QuestionSerializer renders, in a fixed number of queries
+            Prefetch('question', queryset=Question.objects.for_display())
         ).order_by('order')
+
+        language = request.user.profile.preferred_language
+        
+        # Serializers are built once and reused for every row
+        question_serializer = QuestionSerializer()
+        answer_serializer = AnswerChoiceSerializer()
         
         review_data = []
         for eq in exam_questions:
-            question_data = QuestionSerializer(eq.question).data
+            question_data = question_serializer.to_representation(eq.question)
             
             # Get explanation if available
             explanation = None
             if hasattr(eq.question, 'explanation'):
+                translation = eq.question.explanation.get_i18n(language)
                 explanation = {
-                    'detail': eq.question.explanation.translations.filter(
-                        language=request.user.profile.preferred_language
-                    ).first().detail if eq.question.explanation.translations.exists() else '',
+                    'detail': translation.get('detail', ''),
                     'media_url': eq.question.explanation.media_url,
                     'media_type': eq.question.explanation.media_type
                 }
             
             review_data.append({
                 'question': question_data,
-                'selected_answer': AnswerChoiceSerializer(eq.selected_answer).data if eq.selected_answer else None,
+                'selected_answer': answer_serializer.to_representation(eq.selected_answer) if eq.selected_answer else None,
                 'is_correct': eq.is_correct,
                 'time_spent': eq.time_spent,
                 'explanation': explanation
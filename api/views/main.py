@@ -4,10 +4,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
 from django.conf import settings
-from django.db.models import Count, Q
+from django.db.models import Count, Prefetch, Q, Sum, Avg
 from django.utils import timezone
 from django.core.cache import cache
-from collections import defaultdict
 
 from core.models import (
     RoadSignCategory, RoadSign, Question, QuestionTranslation,
@@ -74,14 +73,14 @@ class LandingView(APIView):
             )
             
             # Categories with translations
-            categories = QuestionCategory.objects.prefetch_related('translations').all()
+            categories = QuestionCategory.objects.all()
             category_serializer = QuestionCategorySerializer(
                 categories,
                 many=True,
                 context={'request': request}
             )
             # Categories with translations
-            road_sign_categories = RoadSignCategory.objects.prefetch_related('translations').all()
+            road_sign_categories = RoadSignCategory.objects.all()
             sub_category_serializer = RoadSignCategorySerializer(
                 road_sign_categories,
                 many=True,
@@ -131,14 +130,7 @@ class LandingView(APIView):
             featured_questions = self._get_featured_free_questions()
             
             # ALL FREE questions (full data, same structure as QuestionSerializer)
-            free_questions_qs = Question.objects.select_related(
-                'road_sign_context', 'road_sign_context__category', 'explanation'
-            ).prefetch_related(
-                'translations',
-                'choices__translations',
-                'choices__road_sign_option',
-                'explanation__translations',
-            ).filter(is_premium=False).order_by('difficulty', 'created_at')[:50]  # Limit to 50 for landing
+            free_questions_qs = Question.objects.for_display().filter(is_premium=False).order_by('difficulty', 'created_at')[:50]  # Limit to 50 for landing
             
             question_serializer = QuestionSerializer(
                 free_questions_qs,
@@ -410,38 +402,22 @@ class LandingView(APIView):
     def _get_available_categories(self):
         """Get the number of questions for each category with translations"""
         
-        # Initialize a dictionary to store the question count by category
-        category_question_count = defaultdict(int)
-        
-        # Fetch all questions (you can add filters here if needed)
-        questions = Question.objects.all()
-        
-        # Count how many questions belong to each category
-        for question in questions:
-            category_question_count[question.category] += 1
-        
-        # Fetch all categories and prepare data
-        categories = QuestionCategory.objects.all()
+        # Question counts and translations come with the categories, not per question
+        categories = QuestionCategory.objects.annotate(
+            question_count=Count('questions')
+        )
         
         category_data = []
         
         for category in categories:
-            # Fetch translations for each language (assuming 'en', 'am', 'or', 'ti' etc. as needed)
-            translations = {}
-            for translation in category.translations.all():
-                translations[translation.language] = {
-                    "name": translation.name,
-                    "description": translation.description
-                }
-            
             # Add the category details including translations and question count
             category_data.append(
                 {
                     "id": str(category.id),
                     "code": category.code,
                     "order": category.order,
-                    "translations": translations,
-                    "question_count": category_question_count[category]
+                    "translations": category.i18n,
+                    "question_count": category.question_count
                 }
             )
         
@@ -457,12 +433,21 @@ class LandingView(APIView):
                 road_sign_context__category__isnull=False
             ).select_related(
                 'road_sign_context', 'road_sign_context__category'
+            ).annotate(
+                # Only whether an explanation exists is shown, so don't load it
+                has_explanation=Q(explanation__isnull=False)
+            ).prefetch_related(
+                Prefetch(
+                    'translations',
+                    queryset=QuestionTranslation.objects.filter(language='en'),
+                    to_attr='en_translations'
+                )
             ).order_by('?')[:10]  # Random 10 questions
             
             featured_data = []
             for question in featured_qs:
                 # Get basic info for preview
-                translation = question.translations.filter(language='en').first()
+                translation = question.en_translations[0] if question.en_translations else None
                 if translation:
                     featured_data.append({
                         'id': str(question.id),
@@ -470,7 +455,7 @@ class LandingView(APIView):
                         'difficulty': question.difficulty,
                         'content_preview': translation.content[:100] + '...' if len(translation.content) > 100 else translation.content,
                         'category': question.road_sign_context.category.code if question.road_sign_context.category else None,
-                        'has_explanation': hasattr(question, 'explanation')
+                        'has_explanation': question.has_explanation
                     })
             
             return featured_data
@@ -557,15 +542,18 @@ class LandingView(APIView):
             # Top users by score
             top_users = UserProfile.objects.filter(
                 highest_exam_score__gt=0
-            ).order_by('-highest_exam_score')[:5]
+            ).order_by('-highest_exam_score').values_list(
+                'user__username', 'highest_exam_score', 'accuracy_cached'
+            )[:5]
             
-            top_users_data = []
-            for profile in top_users:
-                top_users_data.append({
-                    'username': profile.user.username,
-                    'score': profile.highest_exam_score,
-                    'accuracy': round(profile.accuracy, 2)
-                })
+            top_users_data = [
+                {
+                    'username': username,
+                    'score': score,
+                    'accuracy': round(accuracy, 2)
+                }
+                for username, score, accuracy in top_users
+            ]
             
             # Recent achievements
             recent_achievements = [
@@ -589,22 +577,25 @@ class LandingView(APIView):
                 }
             ]
             
-            # Community stats
-            total_correct_answers = UserProfile.objects.aggregate(
-                total=Count('correct_answers')
-            )['total'] or 0
-            
-            total_questions_attempted = UserProfile.objects.aggregate(
-                total=Count('total_practice_questions')
-            )['total'] or 0
+            # Community stats in a single aggregate query
+            practiced = Q(total_practice_questions__gt=0)
+            community = UserProfile.objects.aggregate(
+                total_correct_answers=Sum('correct_answers'),
+                total_questions_attempted=Sum('total_practice_questions'),
+                avg_correct=Avg('correct_answers', filter=practiced),
+                avg_practice=Avg('total_practice_questions', filter=practiced)
+            )
+            average_accuracy = 0
+            if community['avg_practice']:
+                average_accuracy = community['avg_correct'] * 100.0 / community['avg_practice']
             
             return {
                 'top_users': top_users_data,
                 'recent_achievements': recent_achievements,
                 'community_stats': {
-                    'total_correct_answers': total_correct_answers,
-                    'total_questions_attempted': total_questions_attempted,
-                    'average_accuracy': self._get_average_user_accuracy()
+                    'total_correct_answers': community['total_correct_answers'] or 0,
+                    'total_questions_attempted': community['total_questions_attempted'] or 0,
+                    'average_accuracy': round(average_accuracy, 2)
                 }
             }
             
@@ -620,18 +611,6 @@ class LandingView(APIView):
                 }
             }
     
-    def _get_average_user_accuracy(self):
-        """Calculate average user accuracy"""
-        from django.db.models import Avg
-        
-        result = UserProfile.objects.filter(
-            total_practice_questions__gt=0
-        ).aggregate(
-            avg_accuracy=Avg('correct_answers') * 100.0 / Avg('total_practice_questions')
-        )
-        
-        return round(result['avg_accuracy'] or 0, 2)
-
     def _get_recommended_bundle(self, bundles):
         """Get recommended bundle (e.g., best value)"""
         try:
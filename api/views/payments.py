@@ -4,11 +4,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.db.models import Prefetch
 from django.utils import timezone
 import logging
 
 from core.authentication import TelegramAuthenticationBackend
-from core.models import PaymentMethod, UserProfile
+from core.models import PaymentMethod, PaymentMethodTranslation, UserProfile
 from core.permissions import IsTelegramAuthenticated
 from core.services import BundleService
 from core.serializers import BundleDefinitionSerializer
@@ -25,7 +26,16 @@ class PaymentMethodViewSet(viewsets.ReadOnlyModelViewSet):
     """
     permission_classes = [AllowAny]
     serializer_class = PaymentMethodSerializer
-    queryset = PaymentMethod.objects.filter(is_active=True).order_by('order')
+    queryset = PaymentMethod.objects.filter(is_active=True).prefetch_related('translations').order_by('order')
+    
+    def get_queryset(self):
+        lang = self.request.query_params.get('lang')
+        if not lang:
+            return super().get_queryset()
+        # Only the requested language and the English fallback
+        return PaymentMethod.objects.filter(is_active=True).prefetch_related(
+            Prefetch('translations', queryset=PaymentMethodTranslation.objects.filter(language__in={lang, 'en'}))
+        ).order_by('order')
     
     def list(self, request, *args, **kwargs):
         """
@@ -336,7 +346,7 @@ class PaymentVerificationView(APIView):
 #     """
 #     permission_classes = [AllowAny]
 #     serializer_class = PaymentMethodSerializer
-#     queryset = PaymentMethod.objects.filter(is_active=True).order_by('order')
+#     queryset = PaymentMethod.objects.filter(is_active=True).prefetch_related('translations').order_by('order')
 
 
 # class PaymentVerificationView(APIView):
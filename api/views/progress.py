@@ -2,10 +2,10 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Q, F
 from django.utils import timezone
 from datetime import timedelta
-from core.models import UserProgress, Question
+from core.models import UserProgress, Question, UserProfile
 from core.serializers import UserProgressSerializer
 import logging
 
@@ -25,11 +25,11 @@ class UserProgressViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
         
         # Update user profile statistics
-        profile = self.request.user.profile
-        profile.total_attempts += 1
-        if serializer.validated_data.get('is_correct'):
-            profile.correct_answers += 1
-        profile.save()
+        is_correct = bool(serializer.validated_data.get('is_correct'))
+        UserProfile.objects.filter(user=self.request.user).update(
+            total_practice_questions=F('total_practice_questions') + 1,
+            correct_answers=F('correct_answers') + int(is_correct)
+        )
     
     @action(detail=False, methods=['post'])
     def bulk_save(self, request):
@@ -60,11 +60,11 @@ class UserProgressViewSet(viewsets.ModelViewSet):
         
         # Update profile statistics
         if created_records:
-            profile = request.user.profile
             correct_count = sum(1 for record in created_records if record.get('is_correct'))
-            profile.total_attempts += len(created_records)
-            profile.correct_answers += correct_count
-            profile.save()
+            UserProfile.objects.filter(user=request.user).update(
+                total_practice_questions=F('total_practice_questions') + len(created_records),
+                correct_answers=F('correct_answers') + correct_count
+            )
         
         response_data = {
             'created': len(created_records),
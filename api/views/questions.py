@@ -6,6 +6,7 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.db.models import Prefetch, Q
 from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from collections import defaultdict
 import logging
@@ -19,13 +20,19 @@ from core.models import (
 )
 from core.serializers import (
     QuestionSerializer, RoadSignSerializer, RoadSignCategorySerializer,
-    PaymentMethodSerializer, OptimizedQuestionSerializer, QuestionCategorySerializer
+    PaymentMethodSerializer, QuestionCategorySerializer
 )
-from core.permissions import IsTelegramAuthenticated
+from core.permissions import IsTelegramAuthenticated, get_request_profile, request_has_active_bundle
+from core.renderers import ORJSONRenderer, dumps
 from django_filters.rest_framework import DjangoFilterBackend
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip (and encoded per streamed chunk) for the offline data dump
+OFFLINE_EXPORT_CHUNK_SIZE = 2000
+# Stands in for the question rows in the cached dump; spliced back in when streaming
+OFFLINE_QUESTIONS_PLACEHOLDER = '__offline_questions__'
+
 
 class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -33,6 +40,7 @@ class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
     Returns ALL data with ALL translations - filtering is done client-side
     """
     permission_classes = [IsAuthenticated, IsTelegramAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     serializer_class = QuestionSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     search_fields = ['translations__content']
@@ -54,17 +62,9 @@ class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
             except UserProfile.DoesNotExist:
                 is_pro_user = False
         
-        queryset = Question.objects.select_related(
-            'road_sign_context', 'road_sign_context__category', 'explanation'
-        ).prefetch_related(
-            Prefetch('translations', queryset=QuestionTranslation.objects.all()),
-            Prefetch(
-                'choices',
-                queryset=AnswerChoice.objects.select_related('road_sign_option').prefetch_related(
-                    Prefetch('translations', queryset=AnswerChoiceTranslation.objects.all())
-                )
-            ),
-            Prefetch('explanation__translations', queryset=ExplanationTranslation.objects.all()),
+        # ?fields=minimal skips explanations entirely (see get_serializer_context)
+        queryset = Question.objects.for_display(
+            with_explanation=not self._is_minimal()
         ).order_by('difficulty', 'created_at')
         
         if not is_pro_user:
@@ -85,6 +85,18 @@ class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
         
         return queryset
     
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # ?lang= narrows the translations to that language plus the English fallback
+        lang = self.request.query_params.get('lang')
+        if lang:
+            context['languages'] = {lang, 'en'}
+        context['minimal'] = self._is_minimal()
+        return context
+    
+    def _is_minimal(self):
+        return self.request.query_params.get('fields') == 'minimal'
+    
     def list(self, request, *args, **kwargs):
         """
         GET /api/v1/questions/
@@ -131,7 +143,7 @@ class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
         Returns metadata about available categories, languages, etc.
         """
         # Get all categories with translations
-        road_sign_categories = RoadSignCategory.objects.prefetch_related('translations').all()
+        road_sign_categories = RoadSignCategory.objects.all()
         road_siign_category_serializer = RoadSignCategorySerializer(road_sign_categories, many=True)
         # categories = QuestionCategory.objects.prefetch_related('translations').all()
         # category_serializer = QuestionCategorySerializer(categories, many=True)
@@ -228,20 +240,12 @@ class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
         category_data = []
         
         for category in categories:
-            # Fetch translations for each language (assuming 'en', 'am', 'or', 'ti' etc. as needed)
-            translations = {}
-            for translation in category.translations.all():
-                translations[translation.language] = {
-                    "name": translation.name,
-                    "description": translation.description
-                }
-            
             # Add the category details including translations and question count
             category_data.append(
                 {
                     "code": category.code,
                     "order": category.order,
-                    "translations": translations,
+                    "translations": category.i18n,
                     "has_questions": category_question_count[category]
                 }
             )
@@ -259,60 +263,37 @@ class AllDataView(APIView):
     Pro users only
     """
     permission_classes = [IsAuthenticated, IsTelegramAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     
     def get(self, request):
         user = request.user
         
         # Verify pro status
-        if not hasattr(user, 'profile') or not user.profile.is_pro_user:
+        if not request_has_active_bundle(request):
             return Response(
                 {'error': 'Premium subscription required for offline cache'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
         # Generate cache key
-        cache_token = user.profile.offline_cache_token
+        cache_token = get_request_profile(request).offline_cache_token
         cache_key = f'offline_cache_v2_{user.id}_{cache_token}'
         
-        # Check cache
+        # Check cache; the per-user entry holds everything but the shared question rows
         cached_data = cache.get(cache_key)
         if cached_data:
             logger.info(f"Serving cached offline data v2 for user {user.id}")
-            return Response(cached_data)
+            return self._stream_response(cached_data, Question.get_offline_payload())
         
         try:
-            # Get ALL questions with ALL data
-            questions = Question.objects.select_related(
-                'road_sign_context', 'road_sign_context__category', 'explanation'
-            ).prefetch_related(
-                Prefetch('translations', queryset=QuestionTranslation.objects.all()),
-                Prefetch(
-                    'choices',
-                    queryset=AnswerChoice.objects.select_related('road_sign_option').prefetch_related(
-                        Prefetch('translations', queryset=AnswerChoiceTranslation.objects.all())
-                    )
-                ),
-                Prefetch('explanation__translations', queryset=ExplanationTranslation.objects.all()),
-            ).all()
-            
-            # Serialize with optimized serializer
-            question_serializer = OptimizedQuestionSerializer(questions, many=True)
+            # Get ALL questions with ALL data, shaped from the i18n columns
+            question_data = Question.get_offline_payload()
             
             # Get ALL road signs with translations
-            road_signs = RoadSign.objects.select_related('category').prefetch_related(
-                Prefetch('translations', queryset=RoadSignTranslation.objects.all())
-            ).all()
+            road_signs = RoadSign.objects.for_display()
             
             road_sign_data = []
-            for road_sign in road_signs:
-                translations = {}
-                for trans in road_sign.translations.all():
-                    translations[trans.language] = {
-                        'name': trans.name,
-                        'meaning': trans.meaning,
-                        'detailed_explanation': trans.detailed_explanation
-                    }
-                
+            for road_sign in road_signs.iterator(chunk_size=OFFLINE_EXPORT_CHUNK_SIZE):
                 road_sign_data.append({
                     'id': str(road_sign.id),
                     'code': road_sign.code,
@@ -322,41 +303,25 @@ class AllDataView(APIView):
                         'code': road_sign.category.code if road_sign.category else None,
                         'translations': self._get_category_translations(road_sign.category)
                     } if road_sign.category else None,
-                    'translations': translations
+                    'translations': road_sign.i18n
                 })
             
             # Get ALL categories with translations
-            categories = RoadSignCategory.objects.prefetch_related('translations').all()
+            categories = RoadSignCategory.objects.all()
             category_data = []
             for category in categories:
-                translations = {}
-                for trans in category.translations.all():
-                    translations[trans.language] = {
-                        'name': trans.name,
-                        'description': trans.description
-                    }
-                
                 category_data.append({
                     'id': str(category.id),
                     'code': category.code,
                     'order': category.order,
-                    'translations': translations
+                    'translations': category.i18n
                 })
             
             # Get ALL active payment methods with translations
-            payment_methods = PaymentMethod.objects.filter(is_active=True).prefetch_related(
-                'translations'
-            ).order_by('order')
+            payment_methods = PaymentMethod.objects.filter(is_active=True).order_by('order')
             
             payment_data = []
             for method in payment_methods:
-                translations = {}
-                for trans in method.translations.all():
-                    translations[trans.language] = {
-                        'account_details': trans.account_details,
-                        'instruction': trans.instruction
-                    }
-                
                 payment_data.append({
                     'id': str(method.id),
                     'name': method.name,
@@ -364,7 +329,7 @@ class AllDataView(APIView):
                     'is_active': method.is_active,
                     'order': method.order,
                     'amount': float(method.amount),
-                    'translations': translations
+                    'translations': method.i18n
                 })
             
             # Prepare complete data dump
@@ -377,7 +342,7 @@ class AllDataView(APIView):
                 'is_pro_user': True,
                 
                 'data': {
-                    'questions': question_serializer.data,
+                    'questions': OFFLINE_QUESTIONS_PLACEHOLDER,
                     'road_signs': road_sign_data,
                     'categories': category_data,
                     'payment_methods': payment_data
@@ -385,10 +350,10 @@ class AllDataView(APIView):
                 
                 'metadata': {
                     'counts': {
-                        'questions': questions.count(),
-                        'road_signs': road_signs.count(),
-                        'categories': categories.count(),
-                        'payment_methods': payment_methods.count()
+                        'questions': len(question_data),
+                        'road_signs': len(road_sign_data),
+                        'categories': len(category_data),
+                        'payment_methods': len(payment_data)
                     },
                     'available_languages': self._get_all_languages(),
                     'question_types': ['IT', 'TI', 'TT'],
@@ -417,7 +382,7 @@ class AllDataView(APIView):
             
             logger.info(f"Generated offline cache v2 for user {user.id}")
             
-            return Response(offline_data)
+            return self._stream_response(offline_data, question_data)
             
         except Exception as e:
             logger.error(f"Error generating offline cache: {str(e)}")
@@ -426,17 +391,25 @@ class AllDataView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    def _stream_response(self, offline_data, question_data):
+        """Stream the dump, encoding question rows a chunk at a time"""
+        offline_data['metadata']['counts']['questions'] = len(question_data)
+        head, tail = dumps(offline_data).split(dumps(OFFLINE_QUESTIONS_PLACEHOLDER))
+        
+        def chunks():
+            yield head + b'['
+            for start in range(0, len(question_data), OFFLINE_EXPORT_CHUNK_SIZE):
+                rows = question_data[start:start + OFFLINE_EXPORT_CHUNK_SIZE]
+                yield (b',' if start else b'') + b','.join(dumps(row) for row in rows)
+            yield b']' + tail
+        
+        return StreamingHttpResponse(chunks(), content_type='application/json')
+    
     def _get_category_translations(self, category):
         """Get translations for a category"""
         if not category:
             return {}
-        translations = {}
-        for trans in category.translations.all():
-            translations[trans.language] = {
-                'name': trans.name,
-                'description': trans.description
-            }
-        return translations
+        return category.i18n
     
     def _get_all_languages(self):
         """Get all languages available in the system"""
@@ -482,14 +455,14 @@ class RefreshCacheTokenView(APIView):
         Generate new cache token for user
         """
         user = request.user
-        if not hasattr(user, 'profile'):
+        profile = getattr(user, 'profile', None)
+        if profile is None:
             return Response(
                 {'error': 'User profile not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         try:
-            profile = user.profile
             
             # Generate new token
             new_token = profile.generate_new_cache_token()
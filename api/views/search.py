@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
+from collections import defaultdict
 import logging
 
 from core.authentication import TelegramAuthenticationBackend
@@ -54,7 +55,7 @@ class SearchView(APIView):
         try:
             # Apply search quota limit
             searchable_limit = None
-            if bundle and not bundle.bundle_definition.is_unlimited_search:
+            if bundle and not bundle.is_unlimited_search:
                 searchable_limit = bundle.search_remaining
             
             results = []
@@ -72,57 +73,57 @@ class SearchView(APIView):
             road_sign_ids = road_sign_qs.values_list('road_sign_id', flat=True).distinct()
             road_signs = RoadSign.objects.filter(
                 id__in=road_sign_ids
-            ).select_related('category').prefetch_related('translations')
+            ).for_display()
             
 
 
+            # One serializer instance per type; fields are bound once, not per result
+            road_sign_serializer = RoadSignSerializer(context={'request': request})
+            question_serializer = QuestionSerializer(context={'request': request})
+            
+            matched_road_signs = []
             for road_sign in road_signs:
-                # Get ALL translations for this road sign
-                road_sign_data = RoadSignSerializer(
-                    road_sign,
-                    context={'request': request}
-                ).data
-                
-                # Find which translations contain the search query
+                # Find which translations (from the i18n column) contain the search query
                 matching_translations = []
-                for translation in road_sign.translations.all():
-                    if (query.lower() in translation.name.lower() or
-                        query.lower() in translation.meaning.lower() or
-                        query.lower() in translation.detailed_explanation.lower()):
-                        
-                        match_field = 'name' if query.lower() in translation.name.lower() else \
-                                    'meaning' if query.lower() in translation.meaning.lower() else \
-                                    'detailed_explanation'
-                        
-                        match_text = getattr(translation, match_field)
+                for language, translation in road_sign.i18n.items():
+                    match_field = next((
+                        field for field in ('name', 'meaning', 'detailed_explanation')
+                        if query.lower() in (translation.get(field) or '').lower()
+                    ), None)
+                    
+                    if match_field:
+                        match_text = translation[match_field]
                         
                         matching_translations.append({
-                            'language': translation.language,
+                            'language': language,
                             'match_field': match_field,
                             'match_text': self._extract_context(match_text, query),
                             'relevance': self._calculate_relevance(query, match_text)
                         })
                 
                 if matching_translations:
-                    # Get related questions
-                    related_questions = Question.objects.filter(
-                        road_sign_context=road_sign
-                    ).prefetch_related('translations')
-                    
-                    question_data = QuestionSerializer(
-                        related_questions,
-                        many=True,
-                        context={'request': request}
-                    ).data
-                    
-                    results.append({
-                        'type': 'road_sign',
-                        'id': str(road_sign.id),
-                        'data': road_sign_data,
-                        'matching_translations': matching_translations,
-                        'related_questions': question_data,
-                        'highest_relevance': max([t['relevance'] for t in matching_translations])
-                    })
+                    matched_road_signs.append((road_sign, matching_translations))
+            
+            # Related questions for every matched road sign in one batch
+            related_by_sign = defaultdict(list)
+            if matched_road_signs:
+                related_questions = Question.objects.filter(
+                    road_sign_context__in=[road_sign for road_sign, _ in matched_road_signs]
+                ).for_display()
+                for question in related_questions:
+                    related_by_sign[question.road_sign_context_id].append(
+                        question_serializer.to_representation(question)
+                    )
+            
+            for road_sign, matching_translations in matched_road_signs:
+                results.append({
+                    'type': 'road_sign',
+                    'id': str(road_sign.id),
+                    'data': road_sign_serializer.to_representation(road_sign),
+                    'matching_translations': matching_translations,
+                    'related_questions': related_by_sign[road_sign.id],
+                    'highest_relevance': max([t['relevance'] for t in matching_translations])
+                })
             
             # Search in ALL question translations across ALL languages
             question_qs = QuestionTranslation.objects.filter(
@@ -133,42 +134,30 @@ class SearchView(APIView):
             question_ids = question_qs.values_list('question_id', flat=True).distinct()
             questions = Question.objects.filter(
                 id__in=question_ids
-            ).select_related('road_sign_context', 'explanation').prefetch_related(
-                'translations', 'choices__translations', 'explanation__translations'
-            )
+            ).for_display()
             
             for question in questions:
-                # Get ALL translations for this question
-                question_data = QuestionSerializer(
-                    question,
-                    context={'request': request}
-                ).data
-                
                 # Find which translations contain the search query
                 matching_translations = []
-                for translation in question.translations.all():
-                    if query.lower() in translation.content.lower():
-                        match_text = translation.content
+                for language, translation in question.i18n.items():
+                    if query.lower() in (translation.get('content') or '').lower():
+                        match_text = translation['content']
                         matching_translations.append({
-                            'language': translation.language,
+                            'language': language,
                             'match_field': 'content',
                             'match_text': self._extract_context(match_text, query),
                             'relevance': self._calculate_relevance(query, match_text)
                         })
                 
                 if matching_translations:
-                    # Get related road sign
-                    road_sign_data = RoadSignSerializer(
-                        question.road_sign_context,
-                        context={'request': request}
-                    ).data
-                    
                     results.append({
                         'type': 'question',
                         'id': str(question.id),
-                        'data': question_data,
+                        'data': question_serializer.to_representation(question),
                         'matching_translations': matching_translations,
-                        'related_road_sign': road_sign_data,
+                        'related_road_sign': road_sign_serializer.to_representation(
+                            question.road_sign_context
+                        ) if question.road_sign_context else None,
                         'highest_relevance': max([t['relevance'] for t in matching_translations])
                     })
             
@@ -2,11 +2,14 @@
 from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.db.models import Count, Prefetch
+from django.db.models.fields.json import KT
+from django.db.models.functions import Substr
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 from django import forms
 from .models import *
+from .utils.translations import translations_list_queryset
 
 
 class TranslationInlineFormSet(forms.models.BaseInlineFormSet):
@@ -24,6 +27,34 @@ class TranslationInlineFormSet(forms.models.BaseInlineFormSet):
                 _("At least one English translation is required.")
             )
 
+
+def is_changelist(request):
+    """True when the admin request is for a changelist rather than a change form"""
+    match = request.resolver_match
+    return bool(match and match.url_name and match.url_name.endswith('_changelist'))
+
+
+class TruncatedPreviewMixin:
+    """Fetch only the head of large text columns on changelists"""
+    preview_fields = {}  # field name -> preview length
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if not self.preview_fields or not is_changelist(request):
+            return qs
+        # One extra character tells the preview whether to add an ellipsis
+        return qs.annotate(**{
+            f'_{field}_preview': Substr(field, 1, length + 1)
+            for field, length in self.preview_fields.items()
+        }).defer(*self.preview_fields)
+
+    def truncated(self, obj, field):
+        length = self.preview_fields[field]
+        text = getattr(obj, f'_{field}_preview', None)
+        if text is None:
+            text = getattr(obj, field) or ''
+        return text[:length] + '...' if len(text) > length else text
+
 class QuestionCategoryTranslationInline(admin.TabularInline):
     model = QuestionCategoryTranslation
     formset = TranslationInlineFormSet
@@ -41,13 +72,11 @@ class QuestionCategoryAdmin(admin.ModelAdmin):
     inlines = [QuestionCategoryTranslationInline]
 
     def name_en(self, obj):
-        trans = obj.translations.filter(language='en').first()
-        return trans.name if trans else '-'
+        return obj.i18n.get('en', {}).get('name') or '-'
     name_en.short_description = 'Name (EN)'
 
     def name_am(self, obj):
-        trans = obj.translations.filter(language='am').first()
-        return trans.name if trans else '-'
+        return obj.i18n.get('am', {}).get('name') or '-'
     name_am.short_description = 'Name (AM)'
    
     
@@ -76,12 +105,20 @@ class RoadSignCategoryAdmin(admin.ModelAdmin):
     )
     
     def translations_count(self, obj):
-        return obj.translations.count()
+        return obj.translations_count
     translations_count.short_description = _('Translations')
+    translations_count.admin_order_field = 'translations_count'
     
     def road_signs_count(self, obj):
-        return obj.road_signs.count()
+        return obj.road_signs_count
     road_signs_count.short_description = _('Road Signs')
+    road_signs_count.admin_order_field = 'road_signs_count'
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            translations_count=Count('translations', distinct=True),
+            road_signs_count=Count('road_signs', distinct=True),
+        )
 
 # Road Sign Admin
 class RoadSignTranslationInline(admin.TabularInline):
@@ -95,7 +132,7 @@ class RoadSignTranslationInline(admin.TabularInline):
 
 @admin.register(RoadSign)
 class RoadSignAdmin(admin.ModelAdmin):
-    list_display = ['code', 'image_preview', 'category', 'translations_count', 'questions_count', 'created_at']
+    list_display = ['code', 'name', 'image_preview', 'category', 'translations_count', 'questions_count', 'created_at']
     list_filter = ['category', 'created_at']
     search_fields = ['code', 'translations__name', 'translations__meaning']
     readonly_fields = ['id', 'created_at', 'updated_at']
@@ -113,17 +150,26 @@ class RoadSignAdmin(admin.ModelAdmin):
         return "-"
     image_preview.short_description = _('Image')
     
+    def name(self, obj):
+        return obj.name
+    name.short_description = _('Name')
+    name.admin_order_field = 'resolved_name'
+    
     def translations_count(self, obj):
         return obj.translations.count()
     translations_count.short_description = _('Translations')
     
     def questions_count(self, obj):
-        return obj.questions.count()
+        return obj.questions_count
     questions_count.short_description = _('Questions')
+    questions_count.admin_order_field = 'questions_count'
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('category').prefetch_related('translations')
+        # The list only counts translations and the name is annotated, so skip the text blobs
+        return qs.with_name().defer('i18n').select_related('category').prefetch_related(
+            Prefetch('translations', queryset=translations_list_queryset(RoadSignTranslation))
+        ).annotate(questions_count=Count('questions'))
 
 
 
@@ -259,7 +305,7 @@ class QuestionAdmin(admin.ModelAdmin):
 
     def category_display(self, obj):
         if obj.category:
-            return obj.category.translations.filter(language='en').first().name or obj.category.code
+            return obj.category.get_i18n('en').get('name') or obj.category.code
         return "—"
     category_display.short_description = _('Category')
     category_display.admin_order_field = 'category__code'
@@ -267,10 +313,13 @@ class QuestionAdmin(admin.ModelAdmin):
     def question_content_preview(self, obj):
         if not obj.pk:
             return "—"
-        en_trans = obj.translations.filter(language='en').first()
-        if en_trans:
-            preview = en_trans.content[:80]
-            return format_html('<span title="{}">{}{}</span>', en_trans.content, preview, '...' if len(en_trans.content) > 80 else '')
+        # _preview carries 81 characters so the extra one flags truncation
+        content = obj._preview
+        if content:
+            return format_html(
+                '<span title="{}">{}{}</span>',
+                obj._preview_title, content[:80], '...' if len(content) > 80 else ''
+            )
         return "—"
     question_content_preview.short_description = _('Question (EN)')
     question_content_preview.admin_order_field = 'translations__content'
@@ -307,13 +356,14 @@ class QuestionAdmin(admin.ModelAdmin):
             'road_sign_context',
             'category',
         ).prefetch_related(
-            'translations',
-            'choices__translations',
             'explanation',
         ).annotate(
             translations_count=Count('translations', distinct=True),
             choices_count=Count('choices', distinct=True),
-        )
+            _preview=Substr(KT('i18n__en__content'), 1, 81),
+            # Hover text; long enough for any real question without pulling whole columns
+            _preview_title=Substr(KT('i18n__en__content'), 1, 500),
+        ).defer('i18n')
 
     # ------------------- Admin Actions -------------------
 
@@ -419,6 +469,7 @@ class QuestionAdmin(admin.ModelAdmin):
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = [
         'user', 'telegram_username',  
+        'has_active_bundle', 'days_remaining',
         'last_active'
     ]
     list_filter = [ 'created_at', 'last_active']
@@ -439,6 +490,20 @@ class UserProfileAdmin(admin.ModelAdmin):
         }),
     )
     
+    def has_active_bundle(self, obj):
+        return obj.has_active_bundle
+    has_active_bundle.boolean = True
+    has_active_bundle.short_description = _('Active Bundle')
+    has_active_bundle.admin_order_field = '_has_active_bundle'
+    
+    def days_remaining(self, obj):
+        return obj.days_remaining
+    days_remaining.short_description = _('Days Left')
+    days_remaining.admin_order_field = '_bundle_expiry_date'
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user').with_bundle_status()
+    
 
 # Payment Method Admin
 class PaymentMethodTranslationInline(admin.TabularInline):
@@ -468,8 +533,12 @@ class PaymentMethodAdmin(admin.ModelAdmin):
     )
     
     def translations_count(self, obj):
-        return obj.translations.count()
+        return obj.translations_count
     translations_count.short_description = _('Translations')
+    translations_count.admin_order_field = 'translations_count'
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(translations_count=Count('translations'))
 
 # User Progress Admin
 @admin.register(UserProgress)
@@ -481,36 +550,40 @@ class UserProgressAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     
     def question_preview(self, obj):
-        translation = obj.question.translations.filter(language='en').first()
-        if translation:
-            return translation.content[:50] + '...' if len(translation.content) > 50 else translation.content
-        return f"Question {obj.question.id}"
+        content = obj.question.get_i18n('en').get('content')
+        if content:
+            return content[:50] + '...' if len(content) > 50 else content
+        return f"Question {obj.question_id}"
     question_preview.short_description = _('Question')
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('user', 'question', 'selected_answer').prefetch_related('question__translations')
+        return qs.select_related('user', 'question', 'selected_answer')
 
 # Direct Translation Model Admins for debugging/management
 @admin.register(RoadSignCategoryTranslation)
-class RoadSignCategoryTranslationAdmin(admin.ModelAdmin):
+class RoadSignCategoryTranslationAdmin(TruncatedPreviewMixin, admin.ModelAdmin):
     list_display = ['category', 'language', 'name', 'description_preview']
+    list_select_related = ['category']
     list_filter = ['language', 'category']
     search_fields = ['name', 'description', 'category__code']
+    preview_fields = {'description': 100}
     
     def description_preview(self, obj):
-        return obj.description[:100] + '...' if len(obj.description) > 100 else obj.description
+        return self.truncated(obj, 'description')
     description_preview.short_description = _('Description')
 
 
 @admin.register(RoadSignTranslation)
-class RoadSignTranslationAdmin(admin.ModelAdmin):
+class RoadSignTranslationAdmin(TruncatedPreviewMixin, admin.ModelAdmin):
     list_display = ['road_sign', 'language', 'name', 'meaning_preview']
+    list_select_related = ['road_sign']
     list_filter = ['language', 'road_sign']
     search_fields = ['name', 'meaning', 'detailed_explanation', 'road_sign__code']
+    preview_fields = {'meaning': 100}
     
     def meaning_preview(self, obj):
-        return obj.meaning[:100] + '...' if len(obj.meaning) > 100 else obj.meaning
+        return self.truncated(obj, 'meaning')
     meaning_preview.short_description = _('Meaning')
     
     def detailed_explanation_preview(self, obj):
@@ -522,62 +595,69 @@ class RoadSignTranslationAdmin(admin.ModelAdmin):
 
 
 @admin.register(QuestionTranslation)
-class QuestionTranslationAdmin(admin.ModelAdmin):
+class QuestionTranslationAdmin(TruncatedPreviewMixin, admin.ModelAdmin):
     list_display = ['question', 'language', 'content_preview']
     list_filter = ['language']
     search_fields = ['content', 'question__road_sign_context__code']
+    preview_fields = {'content': 100}
     
     def content_preview(self, obj):
-        return obj.content[:100] + '...' if len(obj.content) > 100 else obj.content
+        return self.truncated(obj, 'content')
     content_preview.short_description = _('Content')
 
 
 @admin.register(AnswerChoiceTranslation)
-class AnswerChoiceTranslationAdmin(admin.ModelAdmin):
+class AnswerChoiceTranslationAdmin(TruncatedPreviewMixin, admin.ModelAdmin):
     list_display = ['answer_choice', 'language', 'text_preview', 'question_info']
+    list_select_related = ['answer_choice__question']
     list_filter = ['language']
     search_fields = ['text', 'answer_choice__question__translations__content']
+    preview_fields = {'text': 50}
     
     def text_preview(self, obj):
-        return obj.text[:50] + '...' if len(obj.text) > 50 else obj.text
+        return self.truncated(obj, 'text')
     text_preview.short_description = _('Text')
     
     def question_info(self, obj):
         question = obj.answer_choice.question
-        translation = question.translations.filter(language='en').first()
-        return translation.content[:50] + '...' if translation else f"Q{question.id}"
+        content = question.get_i18n('en').get('content')
+        return content[:50] + '...' if content else f"Q{question.id}"
     question_info.short_description = _('Question')
 
 
 @admin.register(ExplanationTranslation)
-class ExplanationTranslationAdmin(admin.ModelAdmin):
+class ExplanationTranslationAdmin(TruncatedPreviewMixin, admin.ModelAdmin):
     list_display = ['explanation', 'language', 'detail_preview', 'question_info']
+    list_select_related = ['explanation__question']
     list_filter = ['language']
     search_fields = ['detail', 'explanation__question__translations__content']
+    preview_fields = {'detail': 100}
     
     def detail_preview(self, obj):
-        return obj.detail[:100] + '...' if len(obj.detail) > 100 else obj.detail
+        return self.truncated(obj, 'detail')
     detail_preview.short_description = _('Detail')
     
     def question_info(self, obj):
         question = obj.explanation.question
-        translation = question.translations.filter(language='en').first()
-        return translation.content[:50] + '...' if translation else f"Q{question.id}"
+        content = question.get_i18n('en').get('content')
+        return content[:50] + '...' if content else f"Q{question.id}"
     question_info.short_description = _('Question')
 
 
 @admin.register(PaymentMethodTranslation)
-class PaymentMethodTranslationAdmin(admin.ModelAdmin):
+class PaymentMethodTranslationAdmin(TruncatedPreviewMixin, admin.ModelAdmin):
     list_display = ['payment_method', 'language', 'account_details_preview', 'instruction_preview']
+    list_select_related = ['payment_method']
     list_filter = ['language', 'payment_method']
     search_fields = ['account_details', 'instruction', 'payment_method__name']
+    preview_fields = {'account_details': 50, 'instruction': 100}
     
     def account_details_preview(self, obj):
-        return obj.account_details[:50] + '...' if len(obj.account_details) > 50 else obj.account_details
+        return self.truncated(obj, 'account_details')
     account_details_preview.short_description = _('Account Details')
     
     def instruction_preview(self, obj):
-        return obj.instruction[:100] + '...' if len(obj.instruction) > 100 else obj.instruction
+        return self.truncated(obj, 'instruction')
     instruction_preview.short_description = _('Instruction')
 
 
@@ -606,6 +686,7 @@ class ExamQuestionInline(admin.StackedInline):
 @admin.register(ExamSession)
 class ExamSessionAdmin(admin.ModelAdmin):
     list_display = ['user', 'start_time', 'end_time', 'status', 'score', 'passed']
+    list_select_related = ['user']
     list_filter = ['status', 'passed']
     search_fields = ['user__username']
     raw_id_fields = ['user']
@@ -621,6 +702,7 @@ class ArticleAdmin(admin.ModelAdmin):
 @admin.register(AIChatHistory)
 class AIChatHistoryAdmin(admin.ModelAdmin):
     list_display = ['user', 'session_id', 'created_at', 'tokens_used']
+    list_select_related = ['user']
     list_filter = ['session_id']
     search_fields = ['user__username', 'question', 'answer']
     raw_id_fields = ['user']
@@ -672,9 +754,14 @@ class ResourceTransactionInline(admin.TabularInline):
 @admin.register(UserBundle)
 class UserBundleAdmin(admin.ModelAdmin):
     list_display = ('user', 'bundle_definition', 'expiry_status', 'exams_remaining', 'chats_remaining', 'is_active')
+    list_select_related = ('user', 'bundle_definition')
     list_filter = ('is_active', 'bundle_definition', 'expiry_date')
     search_fields = ('user__username', 'user__email')
-    readonly_fields = ('purchase_date', 'total_chats_consumed', 'daily_chats_used', 'last_chat_reset')
+    readonly_fields = (
+        'purchase_date', 'total_chats_consumed', 'daily_chats_used', 'last_chat_reset',
+        'exam_quota_snapshot', 'total_chat_quota_snapshot', 'daily_chat_limit_snapshot',
+        'search_quota_snapshot', 'has_unlimited_road_sign_quiz_snapshot',
+    )
     inlines = [ResourceTransactionInline]
 
     def expiry_status(self, obj):
@@ -682,12 +769,43 @@ class UserBundleAdmin(admin.ModelAdmin):
             return format_html('<span style="color: red;">Expired ({})</span>', obj.expiry_date.date())
         return format_html('<span style="color: green;">Expires {}</span>', obj.expiry_date.date())
     expiry_status.short_description = _("Status")
+    expiry_status.admin_order_field = 'expiry_date'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_expiry_status()
+
+class AuditInline(admin.StackedInline):
+    """Read-only request metadata stored beside the record"""
+    fields = ('ip_address', 'user_agent')
+    readonly_fields = fields
+    can_delete = False
+    extra = 0
+    max_num = 0
+
+
+class ResourceTransactionAuditInline(AuditInline):
+    model = ResourceTransactionAudit
+
+
+class BundleOrderAuditInline(AuditInline):
+    model = BundleOrderAudit
+
+
+class BundlePurchaseAuditInline(AuditInline):
+    model = BundlePurchaseAudit
+
 
 @admin.register(ResourceTransaction)
 class ResourceTransactionAdmin(admin.ModelAdmin):
     list_display = ('created_at', 'user', 'transaction_type', 'resource_type', 'quantity_display', 'reference')
+    list_select_related = ('user',)
     list_filter = ('transaction_type', 'resource_type', 'created_at')
     search_fields = ('user__username', 'reference', 'description')
+    inlines = [ResourceTransactionAuditInline]
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.for_listing() if is_changelist(request) else qs
 
     def quantity_display(self, obj):
         color = "green" if obj.quantity > 0 else "red"
@@ -698,9 +816,11 @@ class ResourceTransactionAdmin(admin.ModelAdmin):
 @admin.register(BundleOrder)
 class BundleOrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'bundle_definition', 'order_amount', 'status', 'reference_number', 'created_at')
+    list_select_related = ('user', 'bundle_definition')
     list_filter = ('status', 'payment_method', 'created_at')
     search_fields = ('reference_number', 'user__username', 'id')
-    readonly_fields = ('ip_address', 'user_agent', 'expires_at')
+    readonly_fields = ('expires_at',)
+    inlines = [BundleOrderAuditInline]
     actions = ['mark_as_verified']
 
     def mark_as_verified(self, request, queryset):
@@ -715,9 +835,11 @@ class BundleOrderAdmin(admin.ModelAdmin):
 @admin.register(BundlePurchase)
 class BundlePurchaseAdmin(admin.ModelAdmin):
     list_display = ('user', 'bundle_definition', 'amount_paid', 'payment_status', 'reference_number', 'verified_by', 'created_at')
+    list_select_related = ('user', 'bundle_definition', 'verified_by')
     list_filter = ('payment_status', 'payment_method', 'created_at')
     search_fields = ('reference_number', 'transaction_id', 'user__username')
-    readonly_fields = ('verified_at', 'verified_by', 'user_bundle', 'ip_address', 'user_agent')
+    readonly_fields = ('verified_at', 'verified_by', 'user_bundle')
+    inlines = [BundlePurchaseAuditInline]
     
     fieldsets = (
         (_('Transaction Info'), {'fields': ('user', 'bundle_definition', 'order', 'user_bundle')}),
@@ -5,9 +5,11 @@ import hashlib
 import urllib.parse
 import base64
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
 import logging
@@ -15,13 +17,29 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def webapp_secret_key(bot_token: str) -> bytes:
+    """HMAC key for init_data checks; depends only on the bot token"""
+    return hmac.new(
+        key=b"WebAppData",
+        msg=bot_token.encode(),
+        digestmod=hashlib.sha256
+    ).digest()
+
+
+class TelegramAuth(NamedTuple):
+    """``request.auth`` for Telegram Mini App requests"""
+    telegram_id: int
+    source: str = "telegram"
+
+
 class TelegramAuthenticationBackend(authentication.BaseAuthentication):
     """
     Custom DRF Authentication Backend for Telegram Mini App
     Validates Telegram WebApp init_data passed via Authorization header
     """
     
-    def authenticate(self, request) -> Optional[Tuple[User, None]]:
+    def authenticate(self, request) -> Optional[Tuple[User, TelegramAuth]]:
         """
         Authenticate user using Telegram Mini App init_data
         Header format: Authorization: TMA <init_data>
@@ -48,13 +66,7 @@ class TelegramAuthenticationBackend(authentication.BaseAuthentication):
             else:
                 logger.debug(f"User authenticated via Telegram: {user.username}")
             
-            return (
-                    user,
-                    {
-                        "source": "telegram",
-                        "telegram_id": telegram_user["id"],
-                    }
-                )
+            return user, TelegramAuth(telegram_id=telegram_user["id"])
         
         except AuthenticationFailed:
             raise
@@ -98,11 +110,7 @@ class TelegramAuthenticationBackend(authentication.BaseAuthentication):
             )
             
             # Create secret key
-            secret_key = hmac.new(
-                key=b"WebAppData",
-                msg=settings.TELEGRAM_BOT_TOKEN.encode(),
-                digestmod=hashlib.sha256
-            ).digest()
+            secret_key = webapp_secret_key(settings.TELEGRAM_BOT_TOKEN)
             
             # Compute hash
             computed_hash = hmac.new(
@@ -178,7 +186,10 @@ class TelegramAuthenticationBackend(authentication.BaseAuthentication):
         try:
             # Try to find existing user by telegram_id in profile
             from core.models import UserProfile
-            profile = UserProfile.objects.select_related('user').get(telegram_id=telegram_id)
+            # telegram_data is only shown in admin; don't ship the JSON on every request
+            profile = UserProfile.objects.select_related('user').defer(
+                'telegram_data'
+            ).get(telegram_id=telegram_id)
             
             # Update profile if needed
             update_fields = []
@@ -198,22 +209,30 @@ class TelegramAuthenticationBackend(authentication.BaseAuthentication):
             first_name = telegram_user.get('first_name', '')
             last_name = telegram_user.get('last_name', '')
             
-            # Create Django User
-            user = User.objects.create(
-                username=username,
-                first_name=first_name,
-                last_name=last_name,
-                is_active=True
-            )
-            
-            # Create UserProfile
-            from core.models import UserProfile
-            UserProfile.objects.create(
-                user=user,
-                telegram_id=telegram_id,
-                telegram_username=telegram_user.get('username'),
-                telegram_data=telegram_user
-            )
+            try:
+                # User and profile are written together or not at all
+                with transaction.atomic():
+                    # Create Django User
+                    user = User.objects.create(
+                        username=username,
+                        first_name=first_name,
+                        last_name=last_name,
+                        is_active=True
+                    )
+                    
+                    # Create UserProfile
+                    UserProfile.objects.create(
+                        user=user,
+                        telegram_id=telegram_id,
+                        telegram_username=telegram_user.get('username'),
+                        telegram_data=telegram_user
+                    )
+            except IntegrityError:
+                # A concurrent first login created the profile; use that one
+                profile = UserProfile.objects.select_related('user').defer(
+                    'telegram_data'
+                ).get(telegram_id=telegram_id)
+                return profile.user, False
             
             return user, True
         
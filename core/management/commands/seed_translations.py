@@ -135,6 +135,10 @@ class Command(BaseCommand):
             ),
         ])
         
+        # bulk_create skips post_save, so rebuild the denormalized translations
+        for obj in (road_sign, free_question, correct_answer, wrong_answer, explanation, payment_method):
+            obj.refresh_i18n()
+        
         # Create admin user if not exists
         if not User.objects.filter(username='admin').exists():
             User.objects.create_superuser(
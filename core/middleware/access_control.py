@@ -46,8 +46,17 @@ class AccessControlMiddleware:
     
     def __init__(self, get_response):
         self.get_response = get_response
+        # Compile the endpoint patterns once instead of on every request
+        self.public_patterns = [re.compile(p) for p in self.PUBLIC_ENDPOINTS]
+        self.resource_patterns = [
+            (re.compile(p), resource_type)
+            for p, resource_type in self.RESOURCE_REQUIRED_ENDPOINTS.items()
+        ]
+        self.auth_patterns = [re.compile(p) for p in self.AUTH_REQUIRED_ENDPOINTS]
     
     def __call__(self, request):
+        # One clock read per request, shared by every bundle check downstream
+        request._now = timezone.now()
         return self.get_response(request)
     
     def process_view(self, request, view_func, view_args, view_kwargs):
@@ -57,16 +66,14 @@ class AccessControlMiddleware:
         if path.startswith(('/admin/', '/static/', '/media/')):
             return None
         
-        import re
-        
         # 1. Public endpoints — allow everyone
-        for pattern in self.PUBLIC_ENDPOINTS:
-            if re.match(pattern, path):
+        for pattern in self.public_patterns:
+            if pattern.match(path):
                 return None
         
         # 2. Resource-required endpoints
-        for pattern, resource_type in self.RESOURCE_REQUIRED_ENDPOINTS.items():
-            if re.match(pattern, path):
+        for pattern, resource_type in self.resource_patterns:
+            if pattern.match(path):
                 if not request.user.is_authenticated:
                     return self._json_response(
                         {'error': 'Authentication required'},
@@ -75,17 +82,17 @@ class AccessControlMiddleware:
                 
                 # Check if road sign quiz endpoint
                 if 'road_sign' in path and resource_type == ResourceTransaction.ResourceType.ROAD_SIGN:
-                    bundle = BundleService.get_active_bundle(request.user)
+                    bundle = BundleService.get_active_bundle(request.user, request._now)
                     if bundle and bundle.has_unlimited_road_sign_quiz:
                         return None
                 
                 # Check resource access
                 can_access, bundle, error = BundleService.check_resource_access(
-                    request.user, resource_type
+                    request.user, resource_type, request._now
                 )
                 
                 if not can_access:
-                    if bundle and bundle.is_expired:
+                    if bundle and bundle.is_expired_at(request._now):
                         return self._json_response(
                             {
                                 'error': 'Bundle expired',
@@ -100,15 +107,15 @@ class AccessControlMiddleware:
                                 'error': 'Resource limit reached',
                                 'code': 'RESOURCE_LIMIT',
                                 'message': error,
-                                'remaining_resources': bundle.get_remaining_resources() if bundle else None
+                                'remaining_resources': bundle.get_remaining_resources(request._now) if bundle else None
                             },
                             status=402  # Payment Required
                         )
                 return None
         
         # 3. Auth-required endpoints (but not bundle)
-        for pattern in self.AUTH_REQUIRED_ENDPOINTS:
-            if re.match(pattern, path):
+        for pattern in self.auth_patterns:
+            if pattern.match(path):
                 if not request.user.is_authenticated:
                     return self._json_response(
                         {'error': 'Authentication required'},
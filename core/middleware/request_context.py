@@ -0,0 +1,42 @@
+# core/middleware/request_context.py
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# The request being handled in the current context (thread or task)
+_current_request = ContextVar('current_request', default=None)
+
+
+def get_current_request():
+    """Request handled in this context, or None outside a request"""
+    return _current_request.get()
+
+
+class RequestContextMiddleware:
+    """
+    Keep the current request reachable from services that aren't passed it
+    (audit fields like client IP and user agent)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+    async def __acall__(self, request):
+        token = _current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_request.reset(token)
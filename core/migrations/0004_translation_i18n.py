@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:46
+
+from django.db import migrations, models
+
+
+TRANSLATED_MODELS = {
+    "QuestionCategory": ("name", "description"),
+    "RoadSignCategory": ("name", "description"),
+    "RoadSign": ("name", "meaning", "detailed_explanation"),
+    "Question": ("content",),
+    "AnswerChoice": ("text",),
+    "Explanation": ("detail",),
+    "PaymentMethod": ("account_details", "instruction"),
+}
+
+
+def backfill_i18n(apps, schema_editor):
+    for model_name, fields in TRANSLATED_MODELS.items():
+        model = apps.get_model("core", model_name)
+        for obj in model.objects.prefetch_related("translations"):
+            obj.i18n = {
+                translation.language: {field: getattr(translation, field) for field in fields}
+                for translation in obj.translations.all()
+            }
+            obj.save(update_fields=["i18n"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_paymentmethod_method_type_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answerchoice",
+            name="i18n",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Translations"),
+        ),
+        migrations.AddField(
+            model_name="explanation",
+            name="i18n",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Translations"),
+        ),
+        migrations.AddField(
+            model_name="paymentmethod",
+            name="i18n",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Translations"),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="i18n",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Translations"),
+        ),
+        migrations.AddField(
+            model_name="questioncategory",
+            name="i18n",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Translations"),
+        ),
+        migrations.AddField(
+            model_name="roadsign",
+            name="i18n",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Translations"),
+        ),
+        migrations.AddField(
+            model_name="roadsigncategory",
+            name="i18n",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Translations"),
+        ),
+        migrations.RunPython(backfill_i18n, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:48
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_translation_i18n"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="accuracy_cached",
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Coalesce(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast("correct_answers", models.FloatField()), "*", models.Value(100.0)), "/", django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(models.F("total_practice_questions"), "+", django.db.models.expressions.CombinedExpression(models.F("total_exam_attempts"), "*", models.F("questions_per_exam"))), 0)), 0.0), help_text="Computed by the database from the progress counters", output_field=models.FloatField()),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_userprofile_accuracy_cached"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="userprogress",
+            name="core_userpr_user_id_fbadee_idx",
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(condition=models.Q(("is_premium", False)), fields=["difficulty"], name="idx_free_by_diff"),
+        ),
+        migrations.AddIndex(
+            model_name="questiontranslation",
+            index=models.Index(condition=models.Q(("language", "en")), fields=["question"], name="idx_qtrans_en"),
+        ),
+        migrations.AddIndex(
+            model_name="userprogress",
+            index=models.Index(fields=["user", "-created_at"], name="idx_userprogress_recent"),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_hot_filter_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="userbundle",
+            name="core_userbu_user_id_2ba52e_idx",
+        ),
+        migrations.AddIndex(
+            model_name="userbundle",
+            index=models.Index(fields=["user", "is_active", "expiry_date"], include=("bundle_definition",), name="ub_active_cover_idx"),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:06
+
+from django.db import migrations, models
+
+
+def backfill_quota_snapshots(apps, schema_editor):
+    BundleDefinition = apps.get_model("core", "BundleDefinition")
+    UserBundle = apps.get_model("core", "UserBundle")
+    for definition in BundleDefinition.objects.all():
+        UserBundle.objects.filter(bundle_definition=definition).update(
+            exam_quota_snapshot=definition.exam_quota,
+            total_chat_quota_snapshot=definition.total_chat_quota,
+            daily_chat_limit_snapshot=definition.daily_chat_limit,
+            search_quota_snapshot=definition.search_quota,
+            has_unlimited_road_sign_quiz_snapshot=definition.has_unlimited_road_sign_quiz,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_userbundle_active_cover_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userbundle",
+            name="daily_chat_limit_snapshot",
+            field=models.PositiveIntegerField(default=0, verbose_name="Daily Chat Limit"),
+        ),
+        migrations.AddField(
+            model_name="userbundle",
+            name="exam_quota_snapshot",
+            field=models.PositiveIntegerField(default=0, verbose_name="Exam Quota"),
+        ),
+        migrations.AddField(
+            model_name="userbundle",
+            name="has_unlimited_road_sign_quiz_snapshot",
+            field=models.BooleanField(default=False, verbose_name="Unlimited Road Sign Quiz"),
+        ),
+        migrations.AddField(
+            model_name="userbundle",
+            name="search_quota_snapshot",
+            field=models.PositiveIntegerField(default=0, verbose_name="Search Quota"),
+        ),
+        migrations.AddField(
+            model_name="userbundle",
+            name="total_chat_quota_snapshot",
+            field=models.PositiveIntegerField(default=0, verbose_name="Total Chat Quota"),
+        ),
+        migrations.RunPython(backfill_quota_snapshots, migrations.RunPython.noop),
+    ]
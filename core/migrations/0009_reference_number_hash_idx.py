@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:08
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_userbundle_quota_snapshots"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="bundleorder",
+            name="core_bundle_referen_2e839e_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="bundlepurchase",
+            name="core_bundle_referen_054df5_idx",
+        ),
+        migrations.AddIndex(
+            model_name="bundleorder",
+            index=django.contrib.postgres.indexes.HashIndex(fields=["reference_number"], name="bo_refnum_hash_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bundlepurchase",
+            index=django.contrib.postgres.indexes.HashIndex(fields=["reference_number"], name="bp_refnum_hash_idx"),
+        ),
+    ]
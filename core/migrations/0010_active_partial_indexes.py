@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_reference_number_hash_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="userbundle",
+            name="ub_active_cover_idx",
+        ),
+        migrations.AddIndex(
+            model_name="bundleorder",
+            index=models.Index(condition=models.Q(("status__in", ["pending", "payment_verified", "insufficient_funds"])), fields=["user", "-created_at"], name="bo_open_partial_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userbundle",
+            index=models.Index(condition=models.Q(("is_active", True)), fields=["user", "expiry_date"], include=("bundle_definition",), name="ub_active_partial_idx"),
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+AUDITED_MODELS = (
+    ("ResourceTransaction", "ResourceTransactionAudit"),
+    ("BundleOrder", "BundleOrderAudit"),
+    ("BundlePurchase", "BundlePurchaseAudit"),
+)
+
+
+def copy_audit_columns(apps, schema_editor):
+    for parent_name, audit_name in AUDITED_MODELS:
+        Parent = apps.get_model("core", parent_name)
+        Audit = apps.get_model("core", audit_name)
+        rows = (
+            Parent.objects.exclude(ip_address__isnull=True, user_agent="")
+            .values_list("pk", "ip_address", "user_agent")
+            .iterator(chunk_size=2000)
+        )
+        batch = []
+        for pk, ip_address, user_agent in rows:
+            batch.append(Audit(parent_id=pk, ip_address=ip_address, user_agent=user_agent))
+            if len(batch) >= 2000:
+                Audit.objects.bulk_create(batch)
+                batch = []
+        Audit.objects.bulk_create(batch)
+
+
+
+def restore_audit_columns(apps, schema_editor):
+    for parent_name, audit_name in AUDITED_MODELS:
+        Parent = apps.get_model("core", parent_name)
+        Audit = apps.get_model("core", audit_name)
+        rows = Audit.objects.values_list("parent_id", "ip_address", "user_agent").iterator(chunk_size=2000)
+        Parent.objects.bulk_update(
+            (Parent(pk=pk, ip_address=ip_address, user_agent=user_agent) for pk, ip_address, user_agent in rows),
+            ["ip_address", "user_agent"],
+            batch_size=2000,
+        )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_active_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BundleOrderAudit",
+            fields=[
+                ("ip_address", models.GenericIPAddressField(blank=True, null=True, verbose_name="IP Address")),
+                ("user_agent", models.TextField(blank=True, verbose_name="User Agent")),
+                ("parent", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="audit", serialize=False, to="core.bundleorder", verbose_name="Bundle Order")),
+            ],
+            options={
+                "verbose_name": "Bundle Order Audit",
+                "verbose_name_plural": "Bundle Order Audits",
+            },
+        ),
+        migrations.CreateModel(
+            name="BundlePurchaseAudit",
+            fields=[
+                ("ip_address", models.GenericIPAddressField(blank=True, null=True, verbose_name="IP Address")),
+                ("user_agent", models.TextField(blank=True, verbose_name="User Agent")),
+                ("parent", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="audit", serialize=False, to="core.bundlepurchase", verbose_name="Bundle Purchase")),
+            ],
+            options={
+                "verbose_name": "Bundle Purchase Audit",
+                "verbose_name_plural": "Bundle Purchase Audits",
+            },
+        ),
+        migrations.CreateModel(
+            name="ResourceTransactionAudit",
+            fields=[
+                ("ip_address", models.GenericIPAddressField(blank=True, null=True, verbose_name="IP Address")),
+                ("user_agent", models.TextField(blank=True, verbose_name="User Agent")),
+                ("parent", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="audit", serialize=False, to="core.resourcetransaction", verbose_name="Resource Transaction")),
+            ],
+            options={
+                "verbose_name": "Resource Transaction Audit",
+                "verbose_name_plural": "Resource Transaction Audits",
+            },
+        ),
+        migrations.RunPython(copy_audit_columns, restore_audit_columns),
+        migrations.RemoveField(
+            model_name="bundleorder",
+            name="ip_address",
+        ),
+        migrations.RemoveField(
+            model_name="bundleorder",
+            name="user_agent",
+        ),
+        migrations.RemoveField(
+            model_name="bundlepurchase",
+            name="ip_address",
+        ),
+        migrations.RemoveField(
+            model_name="bundlepurchase",
+            name="user_agent",
+        ),
+        migrations.RemoveField(
+            model_name="resourcetransaction",
+            name="ip_address",
+        ),
+        migrations.RemoveField(
+            model_name="resourcetransaction",
+            name="user_agent",
+        ),
+    ]
@@ -1,13 +1,27 @@
 # core/models.py
-from django.db import models
+from django.db import connections, models, transaction
+from django.core.cache import cache
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import HashIndex
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
-from decimal import Decimal
+from django.db.models import F, Prefetch, Q
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Coalesce, ExtractDay, Greatest, NullIf, Now
+from collections import defaultdict, namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+from functools import cached_property
 import uuid
 import enum
 
+from .middleware.request_context import get_current_request
+
+
+def to_cents(amount):
+    """ETB amount (Decimal, str, int or float) as integer cents"""
+    return int((Decimal(str(amount)) * 100).to_integral_value(ROUND_HALF_UP))
+
 
 class Language(enum.Enum):
     """Language enum for consistent usage across the application"""
@@ -18,17 +32,48 @@ class Language(enum.Enum):
     
     @classmethod
     def choices(cls):
-        return [(member.value, member.name.replace('_', ' ').title()) for member in cls]
+        return LANGUAGE_CHOICES
     
     @classmethod
     def values(cls):
-        return [member.value for member in cls]
+        return LANGUAGE_VALUES
+
+
+# Built once at import time; the enum is static so there is nothing to recompute
+LANGUAGE_CHOICES = tuple((member.value, member.name.replace('_', ' ').title()) for member in Language)
+LANGUAGE_VALUES = tuple(member.value for member in Language)
+
+DIFFICULTY_CHOICES = ((1, 'Easy'), (2, 'Medium'), (3, 'Hard'))
+
+
+class TranslatedModelMixin:
+    """Mixin for models whose translations are denormalized into the ``i18n`` column"""
+    i18n_fields = ()
+
+    def build_i18n(self):
+        """Build the ``{language: {field: value}}`` dict from the translation rows"""
+        return {
+            translation.language: {field: getattr(translation, field) for field in self.i18n_fields}
+            for translation in self.translations.all()
+        }
+
+    def refresh_i18n(self):
+        """Rebuild the ``i18n`` column without touching ``updated_at``"""
+        self.i18n = self.build_i18n()
+        type(self).objects.filter(pk=self.pk).update(i18n=self.i18n)
 
-class QuestionCategory(models.Model):
+    def get_i18n(self, language_code='en'):
+        """Get translated fields for a language, fallback to English"""
+        return self.i18n.get(language_code) or self.i18n.get('en') or {}
+
+class QuestionCategory(TranslatedModelMixin, models.Model):
     """Category for questions (e.g., Road Signs, Traffic Rules, Vehicle Handling, Driver Ethics)"""
+    i18n_fields = ('name', 'description')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     code = models.CharField(max_length=50, unique=True, verbose_name=_("Code"))  # e.g., SIGN, RULES, VEHICLE
     order = models.PositiveSmallIntegerField(default=0, verbose_name=_("Display Order"))
+    i18n = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Translations"))
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -65,11 +110,14 @@ class QuestionCategoryTranslation(models.Model):
     def __str__(self):
         return f"{self.category.code} - {self.get_language_display()}"
 
-class RoadSignCategory(models.Model):
+class RoadSignCategory(TranslatedModelMixin, models.Model):
     """Category for grouping road signs (e.g., Warning, Regulatory, Informative)"""
+    i18n_fields = ('name', 'description')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     code = models.CharField(max_length=50, unique=True, verbose_name=_("Code"))
     order = models.PositiveSmallIntegerField(default=0, verbose_name=_("Display Order"))
+    i18n = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Translations"))
     
     class Meta:
         verbose_name = _("Road Sign Category")
@@ -104,8 +152,27 @@ class RoadSignCategoryTranslation(models.Model):
         return f"{self.category.code} - {self.get_language_display()}"
 
 
-class RoadSign(models.Model):
+class RoadSignQuerySet(models.QuerySet):
+    def with_name(self, language_code='en'):
+        """Annotate ``resolved_name`` from the i18n column, fallback to English then code"""
+        return self.annotate(
+            resolved_name=Coalesce(
+                KT(f'i18n__{language_code}__name'),
+                KT('i18n__en__name'),
+                'code',
+                output_field=models.CharField()
+            )
+        )
+
+    def for_display(self):
+        """Load everything RoadSignSerializer renders; translations come from the i18n columns"""
+        return self.select_related('category')
+
+
+class RoadSign(TranslatedModelMixin, models.Model):
     """Road sign model with category support"""
+    i18n_fields = ('name', 'meaning', 'detailed_explanation')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     code = models.CharField(max_length=50, unique=True, help_text=_("Internal code for the road sign"))
     image = models.ImageField(upload_to='road_signs/')
@@ -117,11 +184,14 @@ class RoadSign(models.Model):
         related_name='road_signs',
         verbose_name=_("Category")
     )
+    i18n = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Translations"))
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = RoadSignQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _("Road Sign")
         verbose_name_plural = _("Road Signs")
@@ -137,30 +207,22 @@ class RoadSign(models.Model):
     @property
     def name(self):
         """Get name in current language or English as fallback"""
-        translation = self.translations.filter(language='en').first()
-        return translation.name if translation else self.code
+        resolved_name = getattr(self, 'resolved_name', None)
+        if resolved_name:
+            return resolved_name
+        return self.i18n.get('en', {}).get('name') or self.code
     
     def get_translation(self, language_code='en'):
         """Get translation for specific language"""
-        return self.translations.filter(language=language_code).first()
+        return self.i18n.get(language_code)
     
     def get_all_translations(self):
         """Get all translations as a dictionary"""
-        translations = {}
-        for translation in self.translations.all():
-            translations[translation.language] = {
-                'name': translation.name,
-                'meaning': translation.meaning,
-                'detailed_explanation': translation.detailed_explanation
-            }
-        return translations
+        return self.i18n
     
     def get_translations_by_language(self, language_code='en'):
         """Get translations for specific language, fallback to English"""
-        translation = self.translations.filter(language=language_code).first()
-        if not translation and language_code != 'en':
-            translation = self.translations.filter(language='en').first()
-        return translation
+        return self.get_i18n(language_code) or None
 
 
 class RoadSignTranslation(models.Model):
@@ -196,8 +258,104 @@ class RoadSignTranslation(models.Model):
         return f"{self.road_sign.code} - {self.get_language_display()}"
 
 
-class Question(models.Model):
+class QuestionQuerySet(models.QuerySet):
+    def for_display(self, with_explanation=True):
+        """Load everything the question serializers render; translations come from the i18n columns"""
+        related = ['category', 'road_sign_context', 'road_sign_context__category']
+        if with_explanation:
+            related.append('explanation')
+        return self.select_related(*related).prefetch_related(
+            Prefetch('choices', queryset=AnswerChoice.objects.select_related('road_sign_option')),
+        )
+
+    def update(self, **kwargs):
+        """Bulk updates skip post_save, so drop the shared offline export here"""
+        rows = super().update(**kwargs)
+        transaction.on_commit(Question.invalidate_offline_payload)
+        return rows
+
+    def offline_payload(self):
+        """
+        OptimizedQuestionSerializer's output built from ``values()`` rows and the
+        ``i18n`` columns: three queries, no model instances or translation rows
+        """
+        questions = list(self.values(
+            'id', 'question_type', 'is_premium', 'difficulty', 'i18n', 'road_sign_context_id',
+            'explanation__id', 'explanation__media_url', 'explanation__media_type', 'explanation__i18n'
+        ))
+
+        choices_by_question = defaultdict(list)
+        road_sign_ids = {q['road_sign_context_id'] for q in questions}
+        for choice in AnswerChoice.objects.filter(question__in=self.values('pk')).values(
+            'id', 'question_id', 'is_correct', 'order', 'i18n', 'road_sign_option_id'
+        ):
+            choices_by_question[choice['question_id']].append(choice)
+            road_sign_ids.add(choice['road_sign_option_id'])
+        road_sign_ids.discard(None)
+
+        storage = RoadSign._meta.get_field('image').storage
+        road_signs = {
+            sign['id']: sign
+            for sign in RoadSign.objects.filter(pk__in=road_sign_ids).values(
+                'id', 'code', 'image', 'i18n', 'category_id', 'category__code', 'category__i18n'
+            )
+        }
+
+        def road_sign_data(sign_id, with_category):
+            sign = road_signs[sign_id]
+            data = {
+                'id': str(sign['id']),
+                'code': sign['code'],
+                'image': storage.url(sign['image']) if sign['image'] else None,
+            }
+            if with_category:
+                data['category'] = {
+                    'id': str(sign['category_id']),
+                    'code': sign['category__code'],
+                    'translations': sign['category__i18n'],
+                } if sign['category_id'] else None
+            data['translations'] = sign['i18n']
+            return data
+
+        payload = []
+        for q in questions:
+            choices = []
+            for choice in choices_by_question[q['id']]:
+                is_image_option = choice['road_sign_option_id'] is not None
+                choices.append({
+                    'id': str(choice['id']),
+                    'is_correct': choice['is_correct'],
+                    'order': choice['order'],
+                    'is_image_option': is_image_option,
+                    'road_sign_option': road_sign_data(
+                        choice['road_sign_option_id'], with_category=False
+                    ) if is_image_option else None,
+                    'translations': {} if is_image_option else choice['i18n'],
+                })
+
+            payload.append({
+                'id': str(q['id']),
+                'road_sign_context': road_sign_data(
+                    q['road_sign_context_id'], with_category=True
+                ) if q['road_sign_context_id'] else None,
+                'translations': q['i18n'],
+                'question_type': q['question_type'],
+                'is_premium': q['is_premium'],
+                'difficulty': q['difficulty'],
+                'choices': choices,
+                'explanation': {
+                    'id': str(q['explanation__id']),
+                    'media_url': q['explanation__media_url'],
+                    'media_type': q['explanation__media_type'],
+                    'translations': q['explanation__i18n'],
+                } if q['explanation__id'] else None,
+            })
+        return payload
+
+
+class Question(TranslatedModelMixin, models.Model):
     """Question model with explicit question type"""
+    i18n_fields = ('content',)
     
     class QuestionType(models.TextChoices):
         IT = 'IT', _('Image to Text')  # Show image, choose text answer
@@ -232,14 +390,17 @@ class Question(models.Model):
     )
     is_premium = models.BooleanField(default=False, verbose_name=_("Premium Question"))
     difficulty = models.PositiveSmallIntegerField(
-        choices=[(1, 'Easy'), (2, 'Medium'), (3, 'Hard')],
+        choices=DIFFICULTY_CHOICES,
         default=2
     )
+    i18n = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Translations"))
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = QuestionQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _("Question")
         verbose_name_plural = _("Questions")
@@ -247,11 +408,27 @@ class Question(models.Model):
         indexes = [
             models.Index(fields=['road_sign_context']),
             models.Index(fields=['is_premium', 'difficulty']),
+            # Most users are on the free tier
+            models.Index(fields=['difficulty'], condition=Q(is_premium=False), name='idx_free_by_diff'),
         ]
     
     def __str__(self):
-        translation = self.translations.filter(language='en').first()
-        return f"Question: {translation.content[:50]}..." if translation else f"Question {self.id}"
+        content = getattr(self, '_preview', None) or self.i18n.get('en', {}).get('content')
+        return f"Question: {content[:50]}..." if content else f"Question {self.id}"
+    
+    OFFLINE_PAYLOAD_CACHE_KEY = 'offline_question_payload'
+    OFFLINE_PAYLOAD_TIMEOUT = 60 * 60  # 1 hour, same as the per-user offline cache
+    
+    @classmethod
+    def get_offline_payload(cls):
+        """Offline export rows; identical for every user, so built once and shared"""
+        return cache.get_or_set(
+            cls.OFFLINE_PAYLOAD_CACHE_KEY, cls.objects.offline_payload, cls.OFFLINE_PAYLOAD_TIMEOUT
+        )
+    
+    @classmethod
+    def invalidate_offline_payload(cls):
+        cache.delete(cls.OFFLINE_PAYLOAD_CACHE_KEY)
     
     @property
     def is_image_to_text(self):
@@ -285,13 +462,18 @@ class QuestionTranslation(models.Model):
         verbose_name_plural = _("Question Translations")
         unique_together = ['question', 'language']
         ordering = ['language']
+        indexes = [
+            models.Index(fields=['question'], condition=Q(language='en'), name='idx_qtrans_en'),
+        ]
     
     def __str__(self):
-        return f"Q{self.question.id} - {self.get_language_display()}"
+        return f"Q{self.question_id} - {self.get_language_display()}"
 
 
-class AnswerChoice(models.Model):
+class AnswerChoice(TranslatedModelMixin, models.Model):
     """Answer choices for questions - can be text or image (road sign)"""
+    i18n_fields = ('text',)
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     question = models.ForeignKey(
         Question, 
@@ -309,6 +491,7 @@ class AnswerChoice(models.Model):
     )
     is_correct = models.BooleanField(default=False, verbose_name=_("Correct Answer"))
     order = models.PositiveSmallIntegerField(default=0, verbose_name=_("Display Order"))
+    i18n = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Translations"))
     
     class Meta:
         verbose_name = _("Answer Choice")
@@ -319,8 +502,8 @@ class AnswerChoice(models.Model):
     def __str__(self):
         if self.road_sign_option:
             return f"Image: {self.road_sign_option.code}"
-        translation = self.translations.filter(language='en').first()
-        return f"{translation.text[:50]}..." if translation else f"Choice {self.id}"
+        text = self.i18n.get('en', {}).get('text')
+        return f"{text[:50]}..." if text else f"Choice {self.id}"
     
     @property
     def is_image_option(self):
@@ -348,11 +531,13 @@ class AnswerChoiceTranslation(models.Model):
         ordering = ['language']
     
     def __str__(self):
-        return f"A{self.answer_choice.id} - {self.get_language_display()}"
+        return f"A{self.answer_choice_id} - {self.get_language_display()}"
 
 
-class Explanation(models.Model):
+class Explanation(TranslatedModelMixin, models.Model):
     """Detailed explanation for questions"""
+    i18n_fields = ('detail',)
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     question = models.OneToOneField(
         Question, 
@@ -366,13 +551,14 @@ class Explanation(models.Model):
         blank=True,
         null=True
     )
+    i18n = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Translations"))
     
     class Meta:
         verbose_name = _("Explanation")
         verbose_name_plural = _("Explanations")
     
     def __str__(self):
-        return f"Explanation for Q{self.question.id}"
+        return f"Explanation for Q{self.question_id}"
 
 
 class ExplanationTranslation(models.Model):
@@ -396,11 +582,13 @@ class ExplanationTranslation(models.Model):
         ordering = ['language']
     
     def __str__(self):
-        return f"Exp{self.explanation.id} - {self.get_language_display()}"
+        return f"Exp{self.explanation_id} - {self.get_language_display()}"
 
 
-class PaymentMethod(models.Model):
+class PaymentMethod(TranslatedModelMixin, models.Model):
     """Available payment methods"""
+    i18n_fields = ('account_details', 'instruction')
+
     class MethodType(models.TextChoices):
         BANK_TRANSFER = 'bank_transfer', _('Bank Transfer')
         MOBILE_WALLET = 'MOBILE_WALLET', _('Mobile Wallet')
@@ -424,6 +612,7 @@ class PaymentMethod(models.Model):
         verbose_name=_("Required Amount"),
         help_text=_("Amount in ETB for Pro subscription")
     )
+    i18n = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Translations"))
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -435,6 +624,36 @@ class PaymentMethod(models.Model):
     
     def __str__(self):
         return self.name
+    
+    CACHE_TIMEOUT = 60 * 60  # 1 hour
+    
+    @staticmethod
+    def cache_key(pk):
+        return f'paymentmethod:{pk}'
+    
+    @classmethod
+    def get_cached(cls, pk, active_only=False):
+        """Get a payment method through the cache; raises DoesNotExist like get()"""
+        method = cache.get_or_set(
+            cls.cache_key(pk), lambda: cls.objects.get(pk=pk), cls.CACHE_TIMEOUT
+        )
+        if active_only and not method.is_active:
+            raise cls.DoesNotExist
+        return method
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(self.cache_key(self.pk))
+    
+    def delete(self, *args, **kwargs):
+        key = self.cache_key(self.pk)
+        result = super().delete(*args, **kwargs)
+        cache.delete(key)
+        return result
+    
+    def refresh_i18n(self):
+        super().refresh_i18n()
+        cache.delete(self.cache_key(self.pk))
 
 
 class PaymentMethodTranslation(models.Model):
@@ -490,7 +709,7 @@ class UserProgress(models.Model):
         verbose_name = _("User Progress")
         verbose_name_plural = _("User Progress")
         indexes = [
-            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['user', '-created_at'], name='idx_userprogress_recent'),
             models.Index(fields=['session_id']),
         ]
     
@@ -498,6 +717,23 @@ class UserProgress(models.Model):
         return f"{self.user.username} - {'Correct' if self.is_correct else 'Incorrect'}"
 
 
+class UserProfileQuerySet(models.QuerySet):
+    def with_bundle_status(self):
+        """Annotate active-bundle status so list views don't fetch each bundle"""
+        return self.annotate(
+            _has_active_bundle=models.Case(
+                models.When(
+                    active_bundle__is_active=True,
+                    active_bundle__expiry_date__gt=Now(),
+                    then=models.Value(True)
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField()
+            ),
+            _bundle_expiry_date=F('active_bundle__expiry_date')
+        )
+
+
 class UserProfile(models.Model):
     """Extended user profile with bundle system"""
     user = models.OneToOneField(
@@ -529,6 +765,17 @@ class UserProfile(models.Model):
     total_practice_questions = models.PositiveIntegerField(default=0)
     correct_answers = models.PositiveIntegerField(default=0)
     highest_exam_score = models.FloatField(default=0)
+    accuracy_cached = models.GeneratedField(
+        expression=Coalesce(
+            Cast('correct_answers', models.FloatField()) * 100.0 / NullIf(
+                F('total_practice_questions') + F('total_exam_attempts') * F('questions_per_exam'), 0
+            ),
+            0.0
+        ),
+        output_field=models.FloatField(),
+        db_persist=True,
+        help_text=_("Computed by the database from the progress counters")
+    )
     last_active = models.DateTimeField(auto_now=True)
     
     # Preferences
@@ -543,6 +790,8 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UserProfileQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _("User Profile")
         verbose_name_plural = _("User Profiles")
@@ -555,16 +804,27 @@ class UserProfile(models.Model):
         bundle_name = self.active_bundle.bundle_definition.name if self.active_bundle else 'No Bundle'
         return f"{self.user.username} - {bundle_name}"
     
+    def use_cached_active_bundle(self):
+        """Fill ``active_bundle`` and its definition from their caches when they are still current"""
+        if not self.active_bundle_id or UserProfile.active_bundle.is_cached(self):
+            return
+        bundle = UserBundle.get_active_for(self.user_id)
+        if bundle is None or bundle.pk != self.active_bundle_id:
+            return
+        bundle.bundle_definition = BundleDefinition.get_cached(bundle.bundle_definition_id)
+        self.active_bundle = bundle
+    
     @property
     def accuracy(self):
-        total_attempts = self.total_practice_questions + (self.total_exam_attempts * self.questions_per_exam)
-        if total_attempts == 0:
-            return 0
-        return (self.correct_answers / total_attempts) * 100
+        """Percent correct, computed by the database; 0.0 before any attempt"""
+        return self.accuracy_cached
     
     @property
     def has_active_bundle(self):
         """Check if user has an active, non-expired bundle"""
+        annotated = getattr(self, '_has_active_bundle', None)
+        if annotated is not None:
+            return annotated
         if not self.active_bundle:
             return False
         return self.active_bundle.is_active and not self.active_bundle.is_expired
@@ -586,14 +846,15 @@ class UserProfile(models.Model):
         """Days remaining in active bundle"""
         if not self.has_active_bundle:
             return 0
-        from django.utils import timezone
-        delta = self.active_bundle.expiry_date - timezone.now()
+        expiry_date = getattr(self, '_bundle_expiry_date', None) or self.active_bundle.expiry_date
+        delta = expiry_date - timezone.now()
         return max(0, delta.days)
     
     def activate_bundle(self, user_bundle):
         """Activate a bundle for the user"""
         self.active_bundle = user_bundle
         self.save(update_fields=['active_bundle', 'updated_at'])
+        UserBundle.invalidate_active(self.user_id)
     
     def generate_new_cache_token(self):
         """Generate a new offline cache token"""
@@ -778,7 +1039,7 @@ class ExamQuestion(models.Model):
         unique_together = ['exam_session', 'question']
     
     def __str__(self):
-        return f"{self.exam_session.id} - Q{self.order}"
+        return f"{self.exam_session_id} - Q{self.order}"
 
 
 
@@ -912,6 +1173,9 @@ class BundleDefinition(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    CACHE_TIMEOUT = 60 * 60  # 1 hour
+    ACTIVE_CACHE_KEY = 'bundledef:active'
+    
     class Meta:
         verbose_name = _("Bundle Definition")
         verbose_name_plural = _("Bundle Definitions")
@@ -920,6 +1184,43 @@ class BundleDefinition(models.Model):
     def __str__(self):
         return f"{self.name} - {self.price_etb} ETB"
     
+    @property
+    def price_cents(self):
+        return to_cents(self.price_etb)
+    
+    @staticmethod
+    def cache_key(pk):
+        return f'bundledef:{pk}'
+    
+    @classmethod
+    def get_cached(cls, pk, active_only=False):
+        """Get a bundle definition through the cache; raises DoesNotExist like get()"""
+        bundle = cache.get_or_set(
+            cls.cache_key(pk), lambda: cls.objects.get(pk=pk), cls.CACHE_TIMEOUT
+        )
+        if active_only and not bundle.is_active:
+            raise cls.DoesNotExist
+        return bundle
+    
+    @classmethod
+    def get_active_cached(cls):
+        """All active bundle definitions, cheapest first, through the cache"""
+        return cache.get_or_set(
+            cls.ACTIVE_CACHE_KEY,
+            lambda: list(cls.objects.filter(is_active=True).order_by('price_etb')),
+            cls.CACHE_TIMEOUT
+        )
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete_many([self.cache_key(self.pk), self.ACTIVE_CACHE_KEY])
+    
+    def delete(self, *args, **kwargs):
+        keys = [self.cache_key(self.pk), self.ACTIVE_CACHE_KEY]
+        result = super().delete(*args, **kwargs)
+        cache.delete_many(keys)
+        return result
+    
     @property
     def is_unlimited_exams(self):
         return self.exam_quota == 0
@@ -933,6 +1234,71 @@ class BundleDefinition(models.Model):
         return self.search_quota == 0
 
 
+class UserBundleQuerySet(models.QuerySet):
+    def active(self):
+        """Active, unexpired bundles (uses the user/is_active/expiry_date index)"""
+        return self.filter(is_active=True, expiry_date__gt=Now())
+
+    def expired(self):
+        """Bundles still flagged active whose expiry date has passed"""
+        return self.filter(is_active=True, expiry_date__lte=Now())
+
+    def with_expiry_status(self):
+        """Annotate ``_is_expired`` so list views don't compare dates per row"""
+        return self.annotate(
+            _is_expired=models.ExpressionWrapper(
+                Q(expiry_date__lt=Now()), output_field=models.BooleanField()
+            )
+        )
+
+    def with_remaining(self):
+        """Annotate ``_days_remaining``; needs native interval support (PostgreSQL)"""
+        if not connections[self.db].features.has_native_duration_field:
+            return self  # get_remaining_resources() falls back to Python date math
+        return self.annotate(
+            _days_remaining=Greatest(ExtractDay(F('expiry_date') - Now()), models.Value(0))
+        )
+
+    def bulk_expire(self):
+        """Deactivate all expired bundles with set-based UPDATEs; returns how many"""
+        with transaction.atomic():
+            rows = list(self.expired().values_list('id', 'user_id'))
+            if not rows:
+                return 0
+            bundle_ids = [bundle_id for bundle_id, _user_id in rows]
+            user_ids = {user_id for _bundle_id, user_id in rows}
+            now = timezone.now()
+
+            self.filter(pk__in=bundle_ids).update(is_active=False, updated_at=now)
+            ResourceTransaction.objects.bulk_create(
+                [
+                    ResourceTransaction(
+                        user_id=user_id,
+                        user_bundle_id=bundle_id,
+                        transaction_type=ResourceTransaction.TransactionType.EXPIRY,
+                        resource_type=None,
+                        quantity=0,
+                        description="Bundle expired"
+                    )
+                    for bundle_id, user_id in rows
+                ],
+                batch_size=500
+            )
+            UserProfile.objects.filter(active_bundle_id__in=bundle_ids).update(
+                active_bundle=None, updated_at=now
+            )
+            transaction.on_commit(lambda: UserBundle.invalidate_active(*user_ids))
+        return len(rows)
+
+
+class UserBundleManager(models.Manager.from_queryset(UserBundleQuerySet)):
+    """Quota checks always read the bundle definition, so join it up front"""
+    def get_queryset(self):
+        return super().get_queryset().select_related('bundle_definition')
+
+
+Eligibility = namedtuple('Eligibility', 'active expired exam chat search')
+
 class UserBundle(models.Model):
     """
     Active bundle instance for a user
@@ -970,16 +1336,41 @@ class UserBundle(models.Model):
     )
     daily_chats_used = models.PositiveIntegerField(default=0, verbose_name=_("Daily Chats Used"))
     
+    # Quotas copied from the bundle definition at purchase time (0 = unlimited)
+    exam_quota_snapshot = models.PositiveIntegerField(default=0, verbose_name=_("Exam Quota"))
+    total_chat_quota_snapshot = models.PositiveIntegerField(default=0, verbose_name=_("Total Chat Quota"))
+    daily_chat_limit_snapshot = models.PositiveIntegerField(default=0, verbose_name=_("Daily Chat Limit"))
+    search_quota_snapshot = models.PositiveIntegerField(default=0, verbose_name=_("Search Quota"))
+    has_unlimited_road_sign_quiz_snapshot = models.BooleanField(
+        default=False,
+        verbose_name=_("Unlimited Road Sign Quiz")
+    )
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UserBundleManager()
+    
+    # Every write to a bundle or to a profile's active_bundle invalidates the entry,
+    # and expiry is checked on read, so the TTL only bounds BundleDefinition edits
+    ACTIVE_CACHE_TIMEOUT = 60 * 60  # 1 hour
+    
     class Meta:
         verbose_name = _("User Bundle")
         verbose_name_plural = _("User Bundles")
         ordering = ['-purchase_date']
         indexes = [
-            models.Index(fields=['user', 'is_active', 'expiry_date']),
+            # Covers "which bundle does this user have" lookups without a heap fetch.
+            # Balance counters are left out: they change on every consume and
+            # indexing them would rule out HOT updates on this table.
+            # Only live bundles are indexed, so the index stays small as history grows.
+            models.Index(
+                fields=['user', 'expiry_date'],
+                include=['bundle_definition'],
+                condition=Q(is_active=True),
+                name='ub_active_partial_idx'
+            ),
             models.Index(fields=['expiry_date']),
             models.Index(fields=['last_chat_reset']),
         ]
@@ -989,89 +1380,188 @@ class UserBundle(models.Model):
     
     def save(self, *args, **kwargs):
         # Set initial balances from bundle definition if this is a new instance
-        if not self.pk:
+        # (pk is a client-side UUID default, so it can't tell new rows apart)
+        if self._state.adding:
+            definition = self.bundle_definition
             self.expiry_date = timezone.now() + timezone.timedelta(
-                days=self.bundle_definition.validity_days
+                days=definition.validity_days
             )
-            self.exams_remaining = self.bundle_definition.exam_quota
-            self.chats_remaining = self.bundle_definition.total_chat_quota
-            self.search_remaining = self.bundle_definition.search_quota
+            self.exams_remaining = definition.exam_quota
+            self.chats_remaining = definition.total_chat_quota
+            self.search_remaining = definition.search_quota
             self.last_chat_reset = timezone.now()
+            self.exam_quota_snapshot = definition.exam_quota
+            self.total_chat_quota_snapshot = definition.total_chat_quota
+            self.daily_chat_limit_snapshot = definition.daily_chat_limit
+            self.search_quota_snapshot = definition.search_quota
+            self.has_unlimited_road_sign_quiz_snapshot = definition.has_unlimited_road_sign_quiz
         
         super().save(*args, **kwargs)
+        self.__dict__.pop('eligibility', None)
+        UserBundle.invalidate_active(self.user_id)
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.__dict__.pop('eligibility', None)
+    
+    @staticmethod
+    def active_cache_key(user_id):
+        return f'ub:active:{user_id}'
+    
+    @staticmethod
+    def _request_active_bundles():
+        """Per-request ``{user_id: bundle}`` memo; empty outside a request"""
+        request = get_current_request()
+        if request is None:
+            return {}
+        return request.__dict__.setdefault('_active_bundles', {})
+    
+    @classmethod
+    def get_active_for(cls, user_id, now=None):
+        """Get the user's active bundle through a short-lived cache, read once per request"""
+        memo = cls._request_active_bundles()
+        if user_id in memo:
+            bundle = memo[user_id]
+        else:
+            bundle = memo[user_id] = cache.get_or_set(
+                cls.active_cache_key(user_id),
+                lambda: cls.objects.active().filter(active_users__user_id=user_id).first(),
+                cls.ACTIVE_CACHE_TIMEOUT
+            )
+        # Expiry is checked on read since a cached bundle can lapse within the TTL
+        if bundle is not None and bundle.is_expired_at(now):
+            return None
+        return bundle
+    
+    @staticmethod
+    def invalidate_active(*user_ids):
+        memo = UserBundle._request_active_bundles()
+        for user_id in user_ids:
+            memo.pop(user_id, None)
+        cache.delete_many([UserBundle.active_cache_key(user_id) for user_id in user_ids])
     
     @property
     def is_expired(self):
-        return self.expiry_date < timezone.now()
+        return self.is_expired_at()
+    
+    def is_expired_at(self, now=None):
+        """is_expired against a caller-supplied request time"""
+        annotated = getattr(self, '_is_expired', None)
+        if annotated is not None:
+            return annotated
+        return self.expiry_date < (now or timezone.now())
     
     @property
-    def can_use_exam(self):
-        if not self.is_active:
-            return False
-        if self.is_expired:
-            return False
-        if self.bundle_definition.is_unlimited_exams:
-            return True
-        return self.exams_remaining > 0
+    def is_unlimited_exams(self):
+        return self.exam_quota_snapshot == 0
     
     @property
-    def can_use_chat(self):
-        if not self.is_active:
-            return False
-        if self.is_expired:
-            return False
+    def is_unlimited_chats(self):
+        return self.total_chat_quota_snapshot == 0
+    
+    @property
+    def is_unlimited_search(self):
+        return self.search_quota_snapshot == 0
+    
+    def compute_eligibility(self, now=None):
+        """Evaluate active/expired and every quota check in one pass"""
+        now = now or timezone.now()
+        expired = self.is_expired_at(now)
+        if not self.is_active or expired:
+            return Eligibility(self.is_active, expired, False, False, False)
         
-        # Check daily limit
-        if self.bundle_definition.daily_chat_limit > 0:
-            # Reset daily counter if needed
-            self._reset_daily_chat_if_needed()
-            if self.daily_chats_used >= self.bundle_definition.daily_chat_limit:
-                return False
+        # Check daily limit, resetting the daily counter if needed
+        chat = True
+        if self.daily_chat_limit_snapshot > 0:
+            self._reset_daily_chat_if_needed(now)
+            chat = self.daily_chats_used < self.daily_chat_limit_snapshot
         
-        # Check total quota
-        if self.bundle_definition.is_unlimited_chats:
-            return True
-        return self.chats_remaining > 0
+        return Eligibility(
+            active=True,
+            expired=False,
+            exam=self.is_unlimited_exams or self.exams_remaining > 0,
+            chat=chat and (self.is_unlimited_chats or self.chats_remaining > 0),
+            search=self.is_unlimited_search or self.search_remaining > 0,
+        )
+    
+    @cached_property
+    def eligibility(self):
+        """Per-instance eligibility; dropped on save() and refresh_from_db()"""
+        return self.compute_eligibility()
+    
+    def eligibility_at(self, now=None):
+        """Like ``eligibility``, but evaluated against ``now`` when not cached yet"""
+        if 'eligibility' not in self.__dict__:
+            self.__dict__['eligibility'] = self.compute_eligibility(now)
+        return self.__dict__['eligibility']
+    
+    @property
+    def can_use_exam(self):
+        return self.eligibility.exam
+    
+    @property
+    def can_use_chat(self):
+        return self.eligibility.chat
     
     @property
     def can_use_search(self):
-        if not self.is_active:
-            return False
-        if self.is_expired:
-            return False
-        if self.bundle_definition.is_unlimited_search:
-            return True
-        return self.search_remaining > 0
+        return self.eligibility.search
     
     @property
     def has_unlimited_road_sign_quiz(self):
-        return self.bundle_definition.has_unlimited_road_sign_quiz
+        return self.has_unlimited_road_sign_quiz_snapshot
     
-    def _reset_daily_chat_if_needed(self):
+    def _reset_daily_chat_if_needed(self, now=None):
         """Reset daily chat counter if it's a new day"""
-        from django.utils import timezone
-        now = timezone.now()
+        now = now or timezone.now()
         
         if (now - self.last_chat_reset).days >= 1:
-            self.daily_chats_used = 0
-            self.last_chat_reset = now
-            self.save(update_fields=['daily_chats_used', 'last_chat_reset'])
+            # Conditional UPDATE: concurrent chat requests reset the row only once
+            reset = UserBundle.objects.filter(
+                pk=self.pk,
+                last_chat_reset__lte=now - timezone.timedelta(days=1)
+            ).update(daily_chats_used=0, last_chat_reset=now)
+            if reset:
+                self.daily_chats_used = 0
+                self.last_chat_reset = now
+                transaction.on_commit(lambda: UserBundle.invalidate_active(self.user_id))
+            else:
+                self.refresh_from_db(fields=['daily_chats_used', 'last_chat_reset'])
+    
+    @property
+    def days_remaining(self):
+        return self.days_remaining_at()
+    
+    def days_remaining_at(self, now=None):
+        annotated = getattr(self, '_days_remaining', None)
+        if annotated is not None:
+            return annotated
+        return max(0, (self.expiry_date - (now or timezone.now())).days)
     
-    def get_remaining_resources(self):
+    def get_remaining_resources(self, now=None):
         """Get dictionary of remaining resources"""
         return {
             'exams_remaining': self.exams_remaining,
             'chats_remaining': self.chats_remaining,
             'search_remaining': self.search_remaining,
             'daily_chats_used': self.daily_chats_used,
-            'daily_chat_limit': self.bundle_definition.daily_chat_limit,
+            'daily_chat_limit': self.daily_chat_limit_snapshot,
             'total_chats_consumed': self.total_chats_consumed,
             'is_active': self.is_active,
             'expiry_date': self.expiry_date,
-            'days_remaining': max(0, (self.expiry_date - timezone.now()).days),
+            'days_remaining': self.days_remaining_at(now),
         }
 
 
+class ResourceTransactionQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Narrow projection for ledger lists; skips the audit text and balance columns"""
+        return self.only(
+            'id', 'user_id', 'user_bundle_id', 'transaction_type', 'resource_type',
+            'quantity', 'reference', 'created_at'
+        )
+
+
 class ResourceTransaction(models.Model):
     """
     Ledger for tracking all resource usage
@@ -1133,11 +1623,11 @@ class ResourceTransaction(models.Model):
     # Metadata
     reference = models.CharField(max_length=100, blank=True, verbose_name=_("Reference"))
     description = models.TextField(blank=True, verbose_name=_("Description"))
-    ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name=_("IP Address"))
-    user_agent = models.TextField(blank=True, verbose_name=_("User Agent"))
     
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ResourceTransactionQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _("Resource Transaction")
         verbose_name_plural = _("Resource Transactions")
@@ -1152,6 +1642,26 @@ class ResourceTransaction(models.Model):
         return f"{self.user.username} - {self.get_transaction_type_display()} - {self.quantity}"
 
 
+class BundleOrderQuerySet(models.QuerySet):
+    OPEN_STATUSES = ('pending', 'payment_verified', 'insufficient_funds')
+
+    def open(self):
+        """Orders still awaiting payment or completion (matches bo_open_partial_idx)"""
+        return self.filter(status__in=self.OPEN_STATUSES)
+
+    def with_suggestions(self):
+        """Prefetch ranked bundle suggestions into ``ranked_suggestions``"""
+        return self.prefetch_related(
+            Prefetch(
+                'orderbundlesuggestion_set',
+                queryset=OrderBundleSuggestion.objects.select_related(
+                    'bundle_definition'
+                ).order_by('-order_score'),
+                to_attr='ranked_suggestions'
+            )
+        )
+
+
 class BundleOrder(models.Model):
     """
     Order for bundle purchase before payment verification
@@ -1229,13 +1739,13 @@ class BundleOrder(models.Model):
     )
     
     # Metadata
-    ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name=_("IP Address"))
-    user_agent = models.TextField(blank=True, verbose_name=_("User Agent"))
     expires_at = models.DateTimeField(verbose_name=_("Expires At"))
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = BundleOrderQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _("Bundle Order")
         verbose_name_plural = _("Bundle Orders")
@@ -1243,7 +1753,13 @@ class BundleOrder(models.Model):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['status', 'expires_at']),
-            models.Index(fields=['reference_number']),
+            # Only ever matched by equality during payment verification
+            HashIndex(fields=['reference_number'], name='bo_refnum_hash_idx'),
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=Q(status__in=['pending', 'payment_verified', 'insufficient_funds']),
+                name='bo_open_partial_idx'
+            ),
         ]
     
     def __str__(self):
@@ -1290,8 +1806,28 @@ class OrderBundleSuggestion(models.Model):
     class Meta:
         unique_together = ['order', 'bundle_definition']
         ordering = ['-order_score']
+    
+    @classmethod
+    def create_batch(cls, order, suggestions):
+        """Save ``(bundle_definition, reason, score)`` suggestions in one INSERT"""
+        return cls.objects.bulk_create(
+            [
+                cls(order=order, bundle_definition=bundle, reason=reason, order_score=score)
+                for bundle, reason, score in suggestions
+            ],
+            batch_size=500,
+            ignore_conflicts=True  # re-verifying an order may suggest the same bundles
+        )
    
 
+class BundlePurchaseManager(models.Manager):
+    """Purchases are rendered with their bundle, payment method and resulting bundle"""
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'bundle_definition', 'payment_method', 'user_bundle__bundle_definition'
+        )
+
+
 class BundlePurchase(models.Model):
     """
     Transaction log for bundle purchases
@@ -1370,12 +1906,12 @@ class BundlePurchase(models.Model):
     )
     
     # Metadata
-    ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name=_("IP Address"))
-    user_agent = models.TextField(blank=True, verbose_name=_("User Agent"))
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = BundlePurchaseManager()
+    
     class Meta:
         verbose_name = _("Bundle Purchase")
         verbose_name_plural = _("Bundle Purchases")
@@ -1383,7 +1919,7 @@ class BundlePurchase(models.Model):
         indexes = [
             models.Index(fields=['user', 'payment_status']),
             models.Index(fields=['payment_status', 'created_at']),
-            models.Index(fields=['reference_number']),
+            HashIndex(fields=['reference_number'], name='bp_refnum_hash_idx'),
         ]
     
     def __str__(self):
@@ -1393,15 +1929,85 @@ class BundlePurchase(models.Model):
         """Create UserBundle when payment is completed"""
         if self.payment_status == self.PaymentStatus.COMPLETED and not self.user_bundle:
             user_bundle = UserBundle.objects.create(
-                user=self.user,
+                user_id=self.user_id,
                 bundle_definition=self.bundle_definition
             )
+            # Only the link changes; don't rewrite every column of the purchase
+            type(self).objects.filter(pk=self.pk).update(
+                user_bundle=user_bundle, updated_at=timezone.now()
+            )
             self.user_bundle = user_bundle
-            self.save()
             return user_bundle
         return None
 
 
+class AuditRecord(models.Model):
+    """
+    Request metadata kept out of the hot ledger/order tables
+    One row per parent, read only by admin and audit views
+    """
+    ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name=_("IP Address"))
+    user_agent = models.TextField(blank=True, verbose_name=_("User Agent"))
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def record(cls, parent, ip_address=None, user_agent=''):
+        """Store the request metadata for ``parent``; no row when there is none"""
+        if not ip_address and not user_agent:
+            return None
+        return cls.objects.create(
+            parent=parent, ip_address=ip_address or None, user_agent=user_agent or ''
+        )
+    
+    def copy_to(self, audit_model, parent):
+        """Attach the same request metadata to another record"""
+        return audit_model.record(parent, self.ip_address, self.user_agent)
+
+
+class ResourceTransactionAudit(AuditRecord):
+    parent = models.OneToOneField(
+        ResourceTransaction,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='audit',
+        verbose_name=_("Resource Transaction")
+    )
+    
+    class Meta:
+        verbose_name = _("Resource Transaction Audit")
+        verbose_name_plural = _("Resource Transaction Audits")
+
+
+class BundleOrderAudit(AuditRecord):
+    parent = models.OneToOneField(
+        BundleOrder,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='audit',
+        verbose_name=_("Bundle Order")
+    )
+    
+    class Meta:
+        verbose_name = _("Bundle Order Audit")
+        verbose_name_plural = _("Bundle Order Audits")
+
+
+class BundlePurchaseAudit(AuditRecord):
+    parent = models.OneToOneField(
+        BundlePurchase,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='audit',
+        verbose_name=_("Bundle Purchase")
+    )
+    
+    class Meta:
+        verbose_name = _("Bundle Purchase Audit")
+        verbose_name_plural = _("Bundle Purchase Audits")
+
+
 
 
 
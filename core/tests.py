@@ -1,3 +1,97 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from core.models import (
+    BundleDefinition, QuestionCategory, QuestionCategoryTranslation,
+    ResourceTransaction, UserBundle, UserProfile
+)
+from core.services import BundleService
+
+
+class ConsumeResourceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='learner')
+        profile = UserProfile.objects.create(user=self.user, telegram_id=1001)
+        definition = BundleDefinition.objects.create(
+            name='Starter', code='STARTER', exam_quota=2, total_chat_quota=0,
+            daily_chat_limit=0, search_quota=0, validity_days=30, price_etb='100.00'
+        )
+        self.bundle = UserBundle.objects.create(user=self.user, bundle_definition=definition)
+        profile.activate_bundle(self.bundle)
+
+    def consume_exam(self, quantity=1):
+        return BundleService.consume_resource(
+            self.user, ResourceTransaction.ResourceType.EXAM, quantity
+        )
+
+    def test_consumes_until_quota_exhausted(self):
+        for remaining in (1, 0):
+            success, bundle, error = self.consume_exam()
+            self.assertTrue(success, error)
+            self.assertEqual(bundle.exams_remaining, remaining)
+
+        success, _, error = self.consume_exam()
+        self.assertFalse(success)
+        self.assertTrue(error)
+
+        self.bundle.refresh_from_db()
+        self.assertEqual(self.bundle.exams_remaining, 0)
+        self.assertEqual(
+            ResourceTransaction.objects.filter(
+                user=self.user, transaction_type=ResourceTransaction.TransactionType.CONSUME
+            ).count(),
+            2
+        )
+
+    def test_rejects_quantity_above_remaining(self):
+        success, _, error = self.consume_exam(quantity=3)
+        self.assertFalse(success)
+        self.assertIn('Remaining: 2', error)
+
+        self.bundle.refresh_from_db()
+        self.assertEqual(self.bundle.exams_remaining, 2)
+
+    def test_guarded_update_stops_stale_cached_bundle(self):
+        # Another request drained the quota after this bundle was cached
+        cached = BundleService.get_active_bundle(self.user)
+        UserBundle.objects.filter(pk=self.bundle.pk).update(exams_remaining=0)
+        self.assertEqual(cached.exams_remaining, 2)
+
+        success, _, error = self.consume_exam()
+        self.assertFalse(success)
+        self.assertEqual(error, "Resource quota exhausted or daily limit reached")
+        self.assertFalse(ResourceTransaction.objects.filter(user=self.user).exists())
+
+
+class SyncParentI18nTests(TestCase):
+    def setUp(self):
+        self.category = QuestionCategory.objects.create(code='RULES')
+
+    def test_rebuilds_parent_i18n_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionCategoryTranslation.objects.create(
+                category=self.category, language='en', name='Traffic Rules'
+            )
+            QuestionCategoryTranslation.objects.create(
+                category=self.category, language='am', name='የትራፊክ ህጎች'
+            )
+            # Nothing is rebuilt until the transaction commits
+            self.category.refresh_from_db()
+            self.assertEqual(self.category.i18n, {})
+
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.i18n['en']['name'], 'Traffic Rules')
+        self.assertEqual(self.category.i18n['am']['name'], 'የትራፊክ ህጎች')
+
+    def test_deleted_translation_leaves_i18n(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            translation = QuestionCategoryTranslation.objects.create(
+                category=self.category, language='en', name='Traffic Rules'
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            translation.delete()
+
+        self.category.refresh_from_db()
+        self.assertNotIn('en', self.category.i18n)
@@ -0,0 +1,55 @@
+from django.db import transaction
+import threading
+
+# Parents waiting for the current transaction to commit, per thread
+_pending = threading.local()
+
+
+class TranslationCache:
+    """
+    Keeps the denormalized ``i18n`` translation column in step with its rows
+    """
+
+    @staticmethod
+    def refresh_on_commit(model, pk):
+        """Queue a parent whose translations changed; rebuilt once after commit"""
+        pending = getattr(_pending, 'parents', None)
+        if pending is None:
+            pending = _pending.parents = set()
+        pending.add((model, pk))
+        transaction.on_commit(TranslationCache.flush_pending)
+
+    @staticmethod
+    def flush_pending():
+        """Rebuild each queued parent's ``i18n`` column"""
+        pending = getattr(_pending, 'parents', None)
+        if not pending:
+            return
+        _pending.parents = set()
+        for model, pk in pending:
+            parent = model.objects.filter(pk=pk).first()
+            if parent is not None:
+                parent.refresh_i18n()
+
+
+def prefetched(obj, related_name='translations'):
+    """Rows of a reverse relation, read straight from the prefetch cache when loaded"""
+    cache = getattr(obj, '_prefetched_objects_cache', {})
+    if related_name in cache:
+        return cache[related_name]
+    return getattr(obj, related_name).all()
+
+
+# Large text columns that list views never render
+HEAVY_TRANSLATION_FIELDS = {
+    'RoadSignTranslation': ('detailed_explanation',),
+    'ExplanationTranslation': ('detail',),
+    'QuestionTranslation': ('content',),
+}
+
+
+def translations_list_queryset(translation_model):
+    """Translation rows without their large text columns, for list views"""
+    return translation_model.objects.defer(
+        *HEAVY_TRANSLATION_FIELDS.get(translation_model.__name__, ())
+    )
@@ -0,0 +1,21 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from payments.verification import parse_amount, _BOA_NUM_RE
+
+
+class ParseAmountTests(SimpleTestCase):
+    def test_plain_amounts(self):
+        self.assertEqual(parse_amount('1,200.00 ETB'), Decimal('1200.00'))
+        self.assertEqual(parse_amount('500 ብር'), Decimal('500'))
+        self.assertEqual(parse_amount('ETB 75.5', _BOA_NUM_RE), Decimal('75.5'))
+
+    def test_signs_and_exponents_use_the_regex_fallback(self):
+        self.assertEqual(parse_amount('-500.00'), Decimal('500.00'))
+        self.assertEqual(parse_amount('ETB 1e3'), Decimal('1'))
+
+    def test_no_amount(self):
+        self.assertIsNone(parse_amount(''))
+        self.assertIsNone(parse_amount('NaN'))
+        self.assertIsNone(parse_amount('Infinity'))
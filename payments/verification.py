@@ -1,14 +1,90 @@
 # payments/verification.py
 import requests
 import re
-import json
-from dataclasses import dataclass
+import orjson
+from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Any
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 import logging
+from django.core.cache import cache
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Fail fast on a stuck connect, give slow receipt pages time to render
+REQUEST_TIMEOUT = (5, 30)
+
+# Receipts are a few KB; anything past this is a broken or hostile endpoint
+MAX_RESPONSE_BYTES = 2_000_000
+
+# Settled transactions never change, so successful lookups are kept a week
+VERIFIED_TIMEOUT = 60 * 60 * 24 * 7
+
+# Telebirr receipt labels, matched against the cell before the value
+_TB_PAYER_LABEL = 'የከፋይ ስም/payer name'
+_TB_AMOUNT_LABEL = 'የተከፈለው መጠን/settled amount'
+
+# Amount parsing: strip separators and the currency, fall back to a regex for anything else
+_CURRENCY_STRIP = str.maketrans('', '', ', ብርETB')
+_NUM_RE = re.compile(r'(\d+\.?\d*)')
+_BOA_NUM_RE = re.compile(r'[\d.]+')
+_PLAIN_AMOUNT_RE = re.compile(r'\d+(\.\d+)?')
+
+
+@lru_cache(maxsize=1)
+def http_session() -> requests.Session:
+    """Process-wide session so repeat lookups reuse provider connections"""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    ))
+    return session
+
+
+def parse_amount(text: str, pattern: re.Pattern = _NUM_RE) -> Optional[Decimal]:
+    """Decimal amount from a receipt string like ``1,200.00 ETB``, None if there is none"""
+    plain = text.translate(_CURRENCY_STRIP)
+    if _PLAIN_AMOUNT_RE.fullmatch(plain):
+        return Decimal(plain)
+    match = pattern.search(text.replace(',', ''))
+    return Decimal(match.group(0)) if match else None
+
+
+def read_body(response: requests.Response, limit: int = MAX_RESPONSE_BYTES) -> bytes:
+    """Read a streamed response body, refusing to buffer more than ``limit`` bytes"""
+    chunks = []
+    total = 0
+    with response:
+        for chunk in response.iter_content(65536):
+            total += len(chunk)
+            if total > limit:
+                raise ValueError(f"Response too large (over {limit} bytes)")
+            chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def receipt_fields(html: str, labels) -> Dict[str, str]:
+    """
+    Read ``{label: value}`` from a receipt table in one parse, where each
+    value is the cell right after the one containing its label
+    """
+    fields = {}
+    for row in LexborHTMLParser(html).css('tr'):
+        cells = row.css('td')
+        for i, cell in enumerate(cells[:-1]):
+            text = cell.text(strip=True).lower()
+            for label in labels:
+                if label not in fields and label in text:
+                    fields[label] = cells[i + 1].text(strip=True)
+        if len(fields) == len(labels):
+            break
+    return fields
+
+@dataclass(slots=True, frozen=True)
 class VerifyResult:
     success: bool
     payer_name: Optional[str] = None
@@ -40,6 +116,21 @@ class PaymentVerifier:
         Returns:
             VerifyResult object with verification status
         """
+        mode = 'mock' if self.mock_mode else 'live'
+        cache_key = f'verify:{mode}:{method.upper()}:{reference}'
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return VerifyResult(**cached)
+       
+        result = self._verify(method, reference)
+       
+        # Failures may be transient or a pending transaction, so only successes are kept
+        if result.success:
+            cache.set(cache_key, asdict(result), VERIFIED_TIMEOUT)
+        return result
+   
+    def _verify(self, method: str, reference: str) -> VerifyResult:
+        """Run the provider lookup for a payment without the result cache."""
         if self.mock_mode:
             return self._mock_verify(method, reference)
        
@@ -70,39 +161,26 @@ class PaymentVerifier:
             logger.info(f"📱 Verifying Telebirr transaction: {reference}")
            
             url = f"https://transactioninfo.ethiotelecom.et/receipt/{reference}"
-            response = requests.get(url, timeout=30)
+            response = http_session().get(url, timeout=REQUEST_TIMEOUT, stream=True)
            
             if response.status_code != 200:
+                response.close()
                 return VerifyResult(
                     success=False,
                     error=f"Failed to fetch receipt (HTTP {response.status_code})"
                 )
            
-            html_content = response.text
+            html_content = read_body(response).decode(response.encoding or 'utf-8', errors='replace')
            
-            # Extract payer name
-            payer_name_match = re.search(
-                r'የከፋይ ስም/Payer Name.*?</td>\s*<td[^>]*>\s*([^<]+)',
-                html_content,
-                re.IGNORECASE | re.DOTALL
-            )
-            payer_name = payer_name_match.group(1).strip() if payer_name_match else None
-           
-            # Extract amount
-            amount_match = re.search(
-                r'የተከፈለው መጠን/Settled Amount.*?</td>\s*<td[^>]*>\s*([^<]+)',
-                html_content,
-                re.IGNORECASE | re.DOTALL
-            )
-            amount_str = amount_match.group(1).strip() if amount_match else None
+            fields = receipt_fields(html_content, (_TB_PAYER_LABEL, _TB_AMOUNT_LABEL))
+            payer_name = fields.get(_TB_PAYER_LABEL) or None
+            amount_str = fields.get(_TB_AMOUNT_LABEL)
            
             amount = None
             if amount_str:
                 try:
-                    amount_match = re.search(r'(\d+\.?\d*)', amount_str.replace(',', ''))
-                    if amount_match:
-                        amount = Decimal(amount_match.group(1))
-                except:
+                    amount = parse_amount(amount_str)
+                except InvalidOperation:
                     pass
            
             if not payer_name or not amount:
@@ -138,19 +216,20 @@ class PaymentVerifier:
            
             api_url = f"https://cs.bankofabyssinia.com/api/onlineSlip/getDetails/?id={reference}{suffix}"
            
-            response = requests.get(api_url, timeout=30, headers={
+            response = http_session().get(api_url, timeout=REQUEST_TIMEOUT, stream=True, headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'application/json, text/plain, */*',
                 'Cache-Control': 'no-cache'
             })
            
             if response.status_code != 200:
+                response.close()
                 return VerifyResult(
                     success=False,
                     error=f"API returned HTTP {response.status_code}"
                 )
            
-            data = response.json()
+            data = orjson.loads(read_body(response))
            
             if not data.get('header', {}).get('status') == 'success':
                 return VerifyResult(
@@ -168,8 +247,7 @@ class PaymentVerifier:
            
             # Parse amount
             amount_str = transaction.get('Transferred Amount', '')
-            amount_match = re.search(r'[\d.]+', amount_str.replace(',', ''))
-            amount = Decimal(amount_match.group(0)) if amount_match else None
+            amount = parse_amount(amount_str, _BOA_NUM_RE)
            
             return VerifyResult(
                 success=True,